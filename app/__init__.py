@@ -27,11 +27,24 @@ def create_app(config_name="default"):
     """
     app = Flask(__name__)
 
+    # Use orjson for JSON responses
+    from app.core.json_provider import OrjsonProvider
+    app.json = OrjsonProvider(app)
+
     # Load configuration
     from app.config import config
     app.config.from_object(config[config_name])
     config[config_name].init_app(app)
 
+    # Take the client address from trusted proxies so per-client limits see real clients
+    hops = app.config.get('PROXY_FIX_HOPS', 0)
+    if hops:
+        from werkzeug.middleware.proxy_fix import ProxyFix
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=hops, x_proto=hops, x_host=hops)
+
+    # Resolve the page size limit once instead of on every paginated request
+    app.extensions['pagination_max'] = app.config.get('MAX_PER_PAGE', app.config.get('MAX_PAGE_SIZE', 100))
+
     # Initialize extensions with app
     db.init_app(app)
     migrate.init_app(app, db)
@@ -25,7 +25,8 @@ class RegisterUseCase:
         self.auth_provider = auth_provider
         self.user_repository = user_repository
     
-    def execute(self, email: str, password: str, first_name: str, last_name: str) -> Dict[str, Any]:
+    def execute(self, email: str, password: str, first_name: str, last_name: str,
+                prevalidated: bool = False) -> Dict[str, Any]:
         """
         Execute the register use case.
         
@@ -34,6 +35,7 @@ class RegisterUseCase:
             password: User's password
             first_name: User's first name
             last_name: User's last name
+            prevalidated: Whether the input already passed RegisterSchema validation
             
         Returns:
             Dict[str, Any]: Registration result with user ID
@@ -42,23 +44,24 @@ class RegisterUseCase:
             ValidationError: If validation fails
             AuthenticationError: If registration fails
         """
-        # Validate input
-        errors = {}
-        
-        if not email:
-            errors['email'] = ['Email is required']
-        
-        if not password:
-            errors['password'] = ['Password is required']
-        
-        if not first_name:
-            errors['first_name'] = ['First name is required']
-        
-        if not last_name:
-            errors['last_name'] = ['Last name is required']
-        
-        if errors:
-            raise ValidationError(errors)
+        # Validate input unless the caller's schema already did
+        if not prevalidated:
+            errors = {}
+            
+            if not email:
+                errors['email'] = ['Email is required']
+            
+            if not password:
+                errors['password'] = ['Password is required']
+            
+            if not first_name:
+                errors['first_name'] = ['First name is required']
+            
+            if not last_name:
+                errors['last_name'] = ['Last name is required']
+            
+            if errors:
+                raise ValidationError(errors)
         
         # Check if user already exists
         existing_user = self.user_repository.get_by_email(email)
@@ -66,7 +69,10 @@ class RegisterUseCase:
             raise ValidationError({'email': ['Email already in use']})
         
         # Register user in Keycloak
-        keycloak_id = self.auth_provider.register_user(email, password, first_name, last_name)
+        keycloak_id = self.auth_provider.register_user(
+            email, password, first_name, last_name,
+            validate_password=not prevalidated
+        )
         
         # Create user in our database
         user = User(
@@ -18,6 +18,14 @@ class Config:
     
     # SQLAlchemy configuration
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Validate pooled connections on checkout; environments override with tuned pools
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_pre_ping': True,
+        'pool_recycle': 3600
+    }
+    
+    # Number of reverse proxies in front of the app whose X-Forwarded-* headers are trusted
+    PROXY_FIX_HOPS = int(os.environ.get('PROXY_FIX_HOPS', 0))
     
     # JWT configuration
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(minutes=15)
@@ -36,9 +44,14 @@ class Config:
     KEYCLOAK_REALM = os.environ.get('KEYCLOAK_REALM')
     KEYCLOAK_CLIENT_ID = os.environ.get('KEYCLOAK_CLIENT_ID')
     KEYCLOAK_CLIENT_SECRET = os.environ.get('KEYCLOAK_CLIENT_SECRET')
+    # Expected token issuer; set when clients reach Keycloak through a different public hostname
+    KEYCLOAK_ISSUER = os.environ.get('KEYCLOAK_ISSUER')
     
     # Google Drive configuration
     GOOGLE_CREDENTIALS_FILE = os.environ.get('GOOGLE_CREDENTIALS_FILE')
+    # Files larger than this are uploaded through a resumable session in chunks
+    DRIVE_RESUMABLE_THRESHOLD = int(os.environ.get('DRIVE_RESUMABLE_THRESHOLD', 5 * 1024 * 1024))
+    DRIVE_CHUNKSIZE = int(os.environ.get('DRIVE_CHUNKSIZE', 16 * 1024 * 1024))
     
     # Logging configuration
     LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
@@ -67,7 +80,8 @@ class DevelopmentConfig(Config):
         'pool_pre_ping': True,  # Detect and reconnect to database if connection is lost
         'pool_recycle': 300,    # Recycle connections after 5 minutes
         'pool_size': 10,        # Maximum number of connections to keep in the pool
-        'max_overflow': 20      # Maximum number of connections to create above pool_size
+        'max_overflow': 20,     # Maximum number of connections to create above pool_size
+        'query_cache_size': 1200  # Compiled statement cache entries per engine
     }
 
     @staticmethod
@@ -114,11 +128,15 @@ class ProductionConfig(Config):
         'pool_size': 20,            # Maximum number of connections to keep in the pool
         'max_overflow': 40,         # Maximum number of connections to create above pool_size
         'pool_timeout': 30,         # Timeout for getting a connection from the pool
+        'query_cache_size': 1200,   # Compiled statement cache entries per engine
         'connect_args': {
             'connect_timeout': 10   # Connection timeout in seconds
         }
     }
 
+    # Production runs behind a load balancer; set PROXY_FIX_HOPS=0 when exposed directly
+    PROXY_FIX_HOPS = int(os.environ.get('PROXY_FIX_HOPS', 1))
+
     # Additional security settings for production
     SESSION_COOKIE_SECURE = True
     SESSION_COOKIE_HTTPONLY = True
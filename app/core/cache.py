@@ -0,0 +1,138 @@
+"""
+In-process cache module.
+
+This module provides a small thread-safe cache with per-entry expiry.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Mapping, Optional, Tuple
+
+
+class TTLCache:
+    """
+    Size-capped dict whose entries expire after a time-to-live.
+
+    Entries are kept in insertion order, so the oldest entries sit at the
+    front. When the cache is full, expired entries are dropped from the front
+    and otherwise the oldest entry is evicted, both without scanning the
+    cache. The cache is per process.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries
+            ttl: Default time-to-live in seconds
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: 'OrderedDict[Hashable, Tuple[float, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Get a value if it has not expired.
+
+        Args:
+            key: Cache key
+            default: Value returned on a miss
+
+        Returns:
+            Any: Cached value or default
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return default
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Store a value. Values with a non-positive TTL are not stored.
+
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl: Time-to-live in seconds, defaults to the cache TTL
+        """
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            # Re-insert so the entry moves to the back with its new expiry
+            self._entries.pop(key, None)
+            self._make_room(now)
+            self._entries[key] = (now + ttl, value)
+
+    def update(self, values: Mapping[Hashable, Any], ttl: Optional[float] = None) -> None:
+        """
+        Store several values with the same TTL.
+
+        Args:
+            values: Values by cache key
+            ttl: Time-to-live in seconds, defaults to the cache TTL
+        """
+        for key, value in values.items():
+            self.set(key, value, ttl)
+
+    def incr(self, key: Hashable, ttl: Optional[float] = None) -> int:
+        """
+        Increment a counter. The TTL only starts when the counter is created,
+        so the counter counts within a fixed window.
+
+        Args:
+            key: Cache key
+            ttl: Window length in seconds, defaults to the cache TTL
+
+        Returns:
+            int: Counter value after the increment
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                self._entries.pop(key, None)
+                self._make_room(now)
+                entry = (now + (self.ttl if ttl is None else ttl), 0)
+            count = entry[1] + 1
+            self._entries[key] = (entry[0], count)
+            return count
+
+    def pop(self, key: Hashable) -> None:
+        """
+        Remove a value if present.
+
+        Args:
+            key: Cache key
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def _make_room(self, now: float) -> None:
+        """
+        Drop entries until one more fits. Must be called with the lock held.
+
+        Expired entries are only dropped from the front, so each insert costs
+        amortised O(1); expired entries further back are dropped once they
+        reach the front or are read.
+
+        Args:
+            now: Current monotonic time
+        """
+        entries = self._entries
+        if len(entries) < self.maxsize:
+            return
+        while entries:
+            oldest = next(iter(entries))
+            if entries[oldest][0] > now:
+                break
+            del entries[oldest]
+        if len(entries) >= self.maxsize:
+            entries.popitem(last=False)
@@ -0,0 +1,123 @@
+"""
+JSON provider module.
+
+This module provides an orjson based JSON provider for the Flask application
+and MessagePack content negotiation.
+"""
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+
+import orjson
+import ormsgpack
+from flask import Response, current_app, request
+from flask.json.provider import JSONProvider
+
+# Non-string keys are stringified like json.dumps does, e.g. id-keyed dicts and marshmallow errors
+_DUMPS_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+_PACKB_OPTIONS = ormsgpack.OPT_NAIVE_UTC
+
+JSON_MIMETYPE = 'application/json'
+MSGPACK_MIMETYPE = 'application/msgpack'
+
+
+def _default(obj: Any) -> Any:
+    """
+    Serialize types orjson does not handle natively.
+
+    Args:
+        obj: Object to serialize
+
+    Returns:
+        Any: JSON serializable representation
+
+    Raises:
+        TypeError: If the object cannot be serialized
+    """
+    if isinstance(obj, Decimal):
+        return str(obj)
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if hasattr(obj, 'to_dict'):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """
+    Serialize an object to JSON bytes.
+
+    Args:
+        obj: Object to serialize
+
+    Returns:
+        bytes: JSON document
+    """
+    return orjson.dumps(obj, default=_default, option=_DUMPS_OPTIONS)
+
+
+def json_response(obj: Any, status: int = 200) -> Response:
+    """
+    Create a JSON response directly from orjson bytes.
+
+    Unlike jsonify, this skips argument normalization and builds the
+    response from the encoded bytes in one step.
+
+    Args:
+        obj: Object to serialize
+        status: HTTP status code
+
+    Returns:
+        Response: JSON response
+    """
+    return current_app.response_class(dumps_bytes(obj), status=status, mimetype='application/json')
+
+
+def wants_msgpack() -> bool:
+    """
+    Check whether the client prefers MessagePack over JSON.
+
+    Returns:
+        bool: True if the Accept header ranks MessagePack above JSON
+    """
+    return request.accept_mimetypes.best_match((JSON_MIMETYPE, MSGPACK_MIMETYPE)) == MSGPACK_MIMETYPE
+
+
+def negotiated_response(obj: Any, status: int = 200) -> Response:
+    """
+    Create a MessagePack or JSON response depending on the Accept header.
+
+    Args:
+        obj: Object to serialize
+        status: HTTP status code
+
+    Returns:
+        Response: MessagePack response if requested, JSON response otherwise
+    """
+    if wants_msgpack():
+        body = ormsgpack.packb(obj, default=_default, option=_PACKB_OPTIONS)
+        response = current_app.response_class(body, status=status, mimetype=MSGPACK_MIMETYPE)
+    else:
+        response = json_response(obj, status)
+    # The body depends on Accept, so shared caches must key on it
+    response.vary.add('Accept')
+    return response
+
+
+class OrjsonProvider(JSONProvider):
+    """JSON provider backed by orjson."""
+
+    mimetype = 'application/json'
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """Serialize data as a JSON string."""
+        return dumps_bytes(obj).decode('utf-8')
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        """Deserialize data from a JSON string or bytes."""
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        """Serialize the arguments and return a JSON response."""
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps_bytes(obj), mimetype=self.mimetype)
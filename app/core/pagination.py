@@ -3,8 +3,12 @@ Pagination utilities module.
 
 This module provides utilities for paginating query results.
 """
+import base64
+import binascii
+from datetime import datetime
 from flask import request, current_app
-from typing import Dict, Any, Tuple, List
+from typing import Dict, Any, Tuple, List, Optional
+from sqlalchemy import and_, or_, tuple_
 from sqlalchemy.orm.query import Query
 
 
@@ -23,8 +27,8 @@ def get_pagination_params() -> Tuple[int, int]:
     # Ensure page is at least 1
     page = max(1, page)
     
-    # Limit per_page to a reasonable value
-    max_per_page = current_app.config.get('MAX_PAGE_SIZE', 100)
+    # Limit per_page to the value resolved at app creation
+    max_per_page = current_app.extensions.get('pagination_max', 100)
     per_page = min(max(1, per_page), max_per_page)
     
     return page, per_page
@@ -75,4 +79,116 @@ def create_pagination_response(items: List[Any], pagination: Dict[str, Any]) ->
     return {
         'items': items,
         'pagination': pagination
-    }
\ No newline at end of file
+    }
+
+
+def encode_cursor(created_at: Optional[datetime], item_id: int) -> str:
+    """
+    Encode a keyset pagination cursor.
+    
+    Args:
+        created_at: Creation timestamp of the last item on the page, may be None
+        item_id: ID of the last item on the page
+        
+    Returns:
+        str: Opaque cursor string
+    """
+    stamp = created_at.isoformat() if created_at is not None else ''
+    raw = f"{stamp}|{item_id}".encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], int]:
+    """
+    Decode a keyset pagination cursor.
+    
+    Args:
+        cursor: Cursor produced by encode_cursor
+        
+    Returns:
+        Tuple[Optional[datetime], int]: (created_at, id)
+        
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8')
+        created_at, item_id = raw.split('|', 1)
+        return (datetime.fromisoformat(created_at) if created_at else None), int(item_id)
+    except (binascii.Error, UnicodeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def keyset_order(created_at_col: Any, id_col: Any) -> Tuple[Any, Any]:
+    """
+    Get the ORDER BY clauses for keyset pagination.
+    
+    Rows without a creation timestamp come first on every database, which
+    matches the default order of a descending index on PostgreSQL.
+    
+    Args:
+        created_at_col: Creation timestamp column
+        id_col: ID column
+        
+    Returns:
+        Tuple[Any, Any]: Order clauses
+    """
+    return created_at_col.desc().nulls_first(), id_col.desc()
+
+
+def keyset_filter(created_at_col: Any, id_col: Any, cursor: str) -> Any:
+    """
+    Build the condition selecting rows after a cursor in keyset order.
+    
+    Args:
+        created_at_col: Creation timestamp column
+        id_col: ID column
+        cursor: Cursor returned with the previous page
+        
+    Returns:
+        Filter expression
+        
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    created_at, item_id = decode_cursor(cursor)
+    if created_at is None:
+        # Still inside the rows without a timestamp; all timestamped rows follow them
+        return or_(and_(created_at_col.is_(None), id_col < item_id), created_at_col.isnot(None))
+    return tuple_(created_at_col, id_col) < (created_at, item_id)
+
+
+def keyset_paginate(query: Query, model: Any, per_page: int,
+                    cursor: Optional[str] = None) -> Tuple[List[Any], Optional[str]]:
+    """
+    Paginate a query on (created_at, id) in descending order.
+    
+    Unlike offset pagination, the cost of fetching a page does not grow
+    with how deep into the result set it is.
+    
+    Args:
+        query: SQLAlchemy query object
+        model: Model with created_at and id columns
+        per_page: Number of items per page
+        cursor: Cursor returned with the previous page
+        
+    Returns:
+        Tuple[List[Any], Optional[str]]: (items, next_cursor)
+        
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    query = query.order_by(*keyset_order(model.created_at, model.id))
+    
+    if cursor:
+        query = query.filter(keyset_filter(model.created_at, model.id, cursor))
+    
+    # Fetch one extra row to know whether another page follows
+    items = query.limit(per_page + 1).all()
+    
+    next_cursor = None
+    if len(items) > per_page:
+        items = items[:per_page]
+        next_cursor = encode_cursor(items[-1].created_at, items[-1].id)
+    
+    return items, next_cursor
@@ -65,6 +65,20 @@ class InvalidStatusTransitionError(BusinessRuleError):
         super().__init__(message=message)
 
 
+class AuthenticationError(DomainError):
+    """Exception raised when authentication fails."""
+    
+    def __init__(self, message="Authentication failed"):
+        super().__init__(message)
+
+
+class InvalidCredentialsError(AuthenticationError):
+    """Exception raised when the identity provider rejects the credentials."""
+    
+    def __init__(self, message="Invalid user credentials"):
+        super().__init__(message)
+
+
 class AuthorizationError(DomainError):
     """Exception raised for domain authorization errors."""
     
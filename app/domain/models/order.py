@@ -21,40 +21,37 @@ class OrderStatus:
     DELIVERED = 'delivered'
     CANCELLED = 'cancelled'
     
+    _ALL = (PENDING, PROCESSING, SHIPPED, DELIVERED, CANCELLED)
+    _VALID = frozenset(_ALL)
+    _FINAL = frozenset((DELIVERED, CANCELLED))
+    _TRANSITIONS = {
+        PENDING: frozenset((PROCESSING, CANCELLED)),
+        PROCESSING: frozenset((SHIPPED, CANCELLED)),
+        SHIPPED: frozenset((DELIVERED, CANCELLED)),
+    }
+    # Comma separated list of statuses for error messages
+    CHOICES = ', '.join(_ALL)
+    
     @classmethod
     def all(cls) -> List[str]:
         """Get all valid statuses."""
-        return [cls.PENDING, cls.PROCESSING, cls.SHIPPED, cls.DELIVERED, cls.CANCELLED]
+        return list(cls._ALL)
     
     @classmethod
     def is_valid(cls, status: str) -> bool:
         """Check if a status is valid."""
-        return status in cls.all()
+        return status in cls._VALID
     
     @classmethod
     def is_final(cls, status: str) -> bool:
         """Check if a status is final (cannot be changed)."""
-        return status in [cls.DELIVERED, cls.CANCELLED]
+        return status in cls._FINAL
     
     @classmethod
     def can_transition(cls, from_status: str, to_status: str) -> bool:
         """Check if a status transition is valid."""
-        # Cannot transition from a final status
-        if cls.is_final(from_status):
-            return False
-        
-        # Cannot transition to the same status
-        if from_status == to_status:
-            return False
-        
-        # Define valid transitions
-        valid_transitions = {
-            cls.PENDING: [cls.PROCESSING, cls.CANCELLED],
-            cls.PROCESSING: [cls.SHIPPED, cls.CANCELLED],
-            cls.SHIPPED: [cls.DELIVERED, cls.CANCELLED]
-        }
-        
-        return to_status in valid_transitions.get(from_status, [])
+        # Final statuses have no transitions and a status never transitions to itself
+        return to_status in cls._TRANSITIONS.get(from_status, ())
 
 
 @dataclass
@@ -120,8 +117,8 @@ class OrderItem:
             'product_id': self.product_id,
             'product_name': self.product_name,
             'quantity': self.quantity,
-            'price': float(self.price.amount) if self.price else None,
-            'subtotal': float(self.subtotal.amount) if self.price else None
+            'price': self.price.amount if self.price else None,
+            'subtotal': self.subtotal.amount if self.price else None
         }
     
     @classmethod
@@ -200,7 +197,7 @@ class Order:
         
         # Validate status
         if not self.status or not OrderStatus.is_valid(self.status):
-            errors['status'] = f"Status must be one of: {', '.join(OrderStatus.all())}"
+            errors['status'] = f"Status must be one of: {OrderStatus.CHOICES}"
         
         # Validate items
         if not self.items:
@@ -323,7 +320,7 @@ class Order:
             InvalidStatusTransitionError: If status transition is invalid
         """
         if not OrderStatus.is_valid(new_status):
-            raise ValidationError({'status': f"Status must be one of: {', '.join(OrderStatus.all())}"})
+            raise ValidationError({'status': f"Status must be one of: {OrderStatus.CHOICES}"})
         
         if not OrderStatus.can_transition(self.status, new_status):
             raise InvalidStatusTransitionError(
@@ -375,12 +372,12 @@ class Order:
             'id': self.id,
             'user_id': self.user_id,
             'status': self.status,
-            'total_amount': float(self.total_amount.amount) if self.total_amount else None,
+            'total_amount': self.total_amount.amount if self.total_amount else None,
             'shipping_address': self.shipping_address.to_dict() if self.shipping_address else None,
             'tracking_number': self.tracking_number,
             'notes': self.notes,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
         }
         
         if include_items:
@@ -165,13 +165,13 @@ class Product:
             'id': self.id,
             'name': self.name,
             'description': self.description,
-            'price': float(self.price.amount) if self.price else None,
+            'price': self.price.amount if self.price else None,
             'image_url': self.image_url,
             'stock': self.stock,
             'sku': self.sku,
             'is_active': self.is_active,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
         }
     
     @classmethod
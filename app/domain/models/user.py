@@ -116,8 +116,8 @@ class User:
             'last_name': self.last_name,
             'full_name': self.full_name,
             'is_active': self.is_active,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
         }
     
     @classmethod
@@ -7,6 +7,8 @@ from dataclasses import dataclass
 from decimal import Decimal
 from typing import Union, Dict, Any
 
+_CENT = Decimal('0.01')
+
 
 @dataclass(frozen=True)
 class Money:
@@ -21,8 +23,11 @@ class Money:
     
     def __post_init__(self):
         """Ensure amount is a Decimal with proper precision."""
+        amount = self.amount
+        if not isinstance(amount, Decimal):
+            amount = Decimal(str(amount))
         # Use object.__setattr__ to modify frozen dataclass
-        object.__setattr__(self, 'amount', Decimal(str(self.amount)).quantize(Decimal('0.01')))
+        object.__setattr__(self, 'amount', amount.quantize(_CENT))
     
     def __add__(self, other: 'Money') -> 'Money':
         """Add two Money objects."""
@@ -90,7 +95,7 @@ class Money:
             Dict[str, Any]: Money as dictionary
         """
         return {
-            'amount': float(self.amount)
+            'amount': self.amount
         }
     
     @classmethod
@@ -4,6 +4,7 @@ Product database model.
 This module defines the SQLAlchemy ORM model for the Product entity.
 """
 from datetime import datetime
+from sqlalchemy import DDL, event
 from app import db
 
 
@@ -24,7 +25,26 @@ class ProductModel(db.Model):
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
-    order_items = db.relationship('OrderItemModel', backref='product', lazy='dynamic')
+    order_items = db.relationship('OrderItemModel', backref='product', lazy='select')
     
     def __repr__(self):
-        return f'<Product {self.name}>'
\ No newline at end of file
+        return f'<Product {self.name}>'
+
+# Partial indexes matching the active product listing sorts
+db.Index('ix_products_active_created_at', ProductModel.created_at.desc(),
+         postgresql_where=ProductModel.is_active)
+db.Index('ix_products_active_price', ProductModel.price,
+         postgresql_where=ProductModel.is_active)
+db.Index('ix_products_active_name', ProductModel.name,
+         postgresql_where=ProductModel.is_active)
+
+# Trigram index so ILIKE '%term%' searches on name and description can use an index
+db.Index('ix_products_search_trgm', ProductModel.name, ProductModel.description,
+         postgresql_using='gin',
+         postgresql_ops={'name': 'gin_trgm_ops', 'description': 'gin_trgm_ops'})
+
+event.listen(
+    ProductModel.__table__,
+    'before_create',
+    DDL('CREATE EXTENSION IF NOT EXISTS pg_trgm').execute_if(dialect='postgresql')
+)
@@ -22,7 +22,12 @@ class UserModel(db.Model):
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
-    orders = db.relationship('OrderModel', backref='user', lazy='dynamic', cascade='all, delete-orphan')
+    orders = db.relationship('OrderModel', backref='user', lazy='select', cascade='all, delete-orphan')
     
     def __repr__(self):
-        return f'<User {self.email}>'
\ No newline at end of file
+        return f'<User {self.email}>'
+
+
+# Partial index matching the active user listing, newest first
+db.Index('ix_users_active_created_at', UserModel.created_at.desc(),
+         postgresql_where=UserModel.is_active)
@@ -54,7 +54,7 @@ class OrderRepository:
         query = OrderModel.query.filter_by(user_id=user_id)
         
         # Apply status filter
-        if status and status in OrderStatus.all():
+        if status and OrderStatus.is_valid(status):
             query = query.filter_by(status=status)
         
         # Apply sorting
@@ -80,7 +80,7 @@ class OrderRepository:
         query = OrderModel.query
         
         # Apply status filter
-        if status and status in OrderStatus.all():
+        if status and OrderStatus.is_valid(status):
             query = query.filter_by(status=status)
         
         # Apply sorting
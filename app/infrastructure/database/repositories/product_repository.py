@@ -4,8 +4,7 @@ Product repository implementation.
 This module implements the product repository using SQLAlchemy ORM.
 """
 from typing import List, Optional, Dict, Any
-from decimal import Decimal
-from sqlalchemy import or_, and_
+from sqlalchemy import or_, and_, select
 
 from app import db
 from app.domain.models.product import Product
@@ -13,6 +12,20 @@ from app.domain.value_objects.money import Money
 from app.domain.exceptions import NotFoundError
 from app.infrastructure.database.models.product import ProductModel
 
+# Columns selected for list queries, in the positional order used by _row_to_domain
+_COLS = (
+    ProductModel.id,
+    ProductModel.name,
+    ProductModel.description,
+    ProductModel.price,
+    ProductModel.image_url,
+    ProductModel.stock,
+    ProductModel.sku,
+    ProductModel.is_active,
+    ProductModel.created_at,
+    ProductModel.updated_at,
+)
+
 
 class ProductRepository:
     """Repository for Product domain model using SQLAlchemy ORM."""
@@ -70,12 +83,12 @@ class ProductRepository:
         Returns:
             List[Product]: List of product domain models
         """
-        query = ProductModel.query.filter_by(is_active=True)
+        query = select(*_COLS).where(ProductModel.is_active.is_(True))
         
         # Apply search filter
         if search:
             search_term = f"%{search}%"
-            query = query.filter(
+            query = query.where(
                 or_(
                     ProductModel.name.ilike(search_term),
                     ProductModel.description.ilike(search_term)
@@ -84,11 +97,11 @@ class ProductRepository:
         
         # Apply price filters
         if min_price is not None and max_price is not None:
-            query = query.filter(and_(ProductModel.price >= min_price, ProductModel.price <= max_price))
+            query = query.where(and_(ProductModel.price >= min_price, ProductModel.price <= max_price))
         elif min_price is not None:
-            query = query.filter(ProductModel.price >= min_price)
+            query = query.where(ProductModel.price >= min_price)
         elif max_price is not None:
-            query = query.filter(ProductModel.price <= max_price)
+            query = query.where(ProductModel.price <= max_price)
         
         # Apply sorting
         if sort_by not in ['name', 'price', 'created_at']:
@@ -104,9 +117,12 @@ class ProductRepository:
         query = query.order_by(sort_column)
         
         # Apply pagination
-        products = query.paginate(page=page, per_page=per_page)
+        query = query.limit(per_page).offset((max(page, 1) - 1) * per_page)
+        
+        # Plain row tuples skip the ORM identity map and instrumented attributes
+        rows = db.session.execute(query)
         
-        return [self._to_domain(product) for product in products.items]
+        return [self._row_to_domain(row) for row in rows]
     
     def create(self, product: Product) -> Product:
         """
@@ -226,11 +242,34 @@ class ProductRepository:
             id=product_model.id,
             name=product_model.name,
             description=product_model.description,
-            price=Money(Decimal(str(product_model.price))),
+            price=Money(product_model.price),
             image_url=product_model.image_url,
             stock=product_model.stock,
             sku=product_model.sku,
             is_active=product_model.is_active,
             created_at=product_model.created_at,
             updated_at=product_model.updated_at
+        )
+    
+    def _row_to_domain(self, row: tuple) -> Product:
+        """
+        Convert a row selected with _COLS to domain model.
+        
+        Args:
+            row: Row tuple in _COLS order
+            
+        Returns:
+            Product: Product domain model
+        """
+        return Product(
+            id=row[0],
+            name=row[1],
+            description=row[2],
+            price=Money(row[3]),
+            image_url=row[4],
+            stock=row[5],
+            sku=row[6],
+            is_active=row[7],
+            created_at=row[8],
+            updated_at=row[9]
         )
\ No newline at end of file
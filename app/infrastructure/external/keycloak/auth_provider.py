@@ -5,8 +5,33 @@ This module provides an authentication provider using Keycloak.
 """
 from typing import Dict, Any, Optional, Tuple
 
+from keycloak.exceptions import KeycloakAuthenticationError, KeycloakError
+
 from app.infrastructure.external.keycloak.client import KeycloakClient
-from app.domain.exceptions import AuthenticationError, ValidationError
+from app.domain.exceptions import AuthenticationError, InvalidCredentialsError, ValidationError
+
+
+def _is_credential_rejection(error: Exception) -> bool:
+    """
+    Check whether a Keycloak token error means the credentials were rejected.
+    
+    Keycloak answers bad credentials with 401 and disabled or locked accounts
+    with 400 invalid_grant; transport and server errors are not rejections.
+    
+    Args:
+        error: Exception raised by the token request
+        
+    Returns:
+        bool: True if Keycloak rejected the credentials
+    """
+    if isinstance(error, KeycloakAuthenticationError):
+        return True
+    if isinstance(error, KeycloakError) and error.response_code == 400:
+        body = error.response_body or b''
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        return b'invalid_grant' in body
+    return False
 
 
 class KeycloakAuthProvider:
@@ -28,12 +53,18 @@ class KeycloakAuthProvider:
             Dict[str, Any]: Authentication tokens and user info
             
         Raises:
-            AuthenticationError: If authentication fails
+            InvalidCredentialsError: If Keycloak rejects the credentials
+            AuthenticationError: If authentication fails for any other reason
         """
         try:
             # Get token from Keycloak
             token_response = self.client.login(username, password)
-            
+        except Exception as e:
+            if _is_credential_rejection(e):
+                raise InvalidCredentialsError(f"Login failed: {str(e)}")
+            raise AuthenticationError(f"Login failed: {str(e)}")
+        
+        try:
             # Get user info
             userinfo = self.client.get_userinfo(token_response['access_token'])
             
@@ -106,7 +137,8 @@ class KeycloakAuthProvider:
         except Exception:
             return {}
     
-    def register_user(self, email: str, password: str, first_name: str, last_name: str) -> str:
+    def register_user(self, email: str, password: str, first_name: str, last_name: str,
+                      validate_password: bool = True) -> str:
         """
         Register a new user.
         
@@ -115,6 +147,7 @@ class KeycloakAuthProvider:
             password: User's password
             first_name: User's first name
             last_name: User's last name
+            validate_password: Whether to check password strength
             
         Returns:
             str: User ID
@@ -125,7 +158,8 @@ class KeycloakAuthProvider:
         """
         try:
             # Validate password
-            self._validate_password(password)
+            if validate_password:
+                self._validate_password(password)
             
             # Create user in Keycloak
             user_id = self.client.create_user({
@@ -3,7 +3,7 @@ Authentication middleware.
 
 This module provides middleware for authentication and authorization.
 """
-from functools import wraps
+from functools import lru_cache, wraps
 from flask import request, jsonify, current_app, g
 from typing import List, Optional, Callable
 
@@ -11,6 +11,29 @@ from app.infrastructure.external.keycloak.auth_provider import KeycloakAuthProvi
 from app.infrastructure.database.repositories.user_repository import UserRepository
 from app.core.security import get_token_from_header
 
+@lru_cache(maxsize=1)
+def get_auth_provider() -> KeycloakAuthProvider:
+    """
+    Get the shared Keycloak authentication provider.
+    
+    Created on first use, since the Keycloak clients read the app config.
+    
+    Returns:
+        KeycloakAuthProvider: Authentication provider
+    """
+    return KeycloakAuthProvider()
+
+
+@lru_cache(maxsize=1)
+def get_user_repository() -> UserRepository:
+    """
+    Get the shared user repository.
+    
+    Returns:
+        UserRepository: User repository
+    """
+    return UserRepository()
+
 
 def token_required(roles: Optional[List[str]] = None) -> Callable:
     """
@@ -22,6 +45,8 @@ def token_required(roles: Optional[List[str]] = None) -> Callable:
     Returns:
         Callable: Decorated function
     """
+    required_roles = frozenset(roles or ())
+    
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
@@ -32,22 +57,20 @@ def token_required(roles: Optional[List[str]] = None) -> Callable:
             
             try:
                 # Validate token
-                auth_provider = KeycloakAuthProvider()
-                token_info = auth_provider.validate_token(token)
+                token_info = get_auth_provider().validate_token(token)
                 
                 if not token_info or not token_info.get('active', False):
                     return jsonify({'error': 'Invalid or expired token'}), 401
                 
                 # Check roles if specified
-                if roles:
-                    user_roles = token_info.get('realm_access', {}).get('roles', [])
-                    if not any(role in user_roles for role in roles):
+                if required_roles:
+                    user_roles = frozenset(token_info.get('realm_access', {}).get('roles', ()))
+                    if user_roles.isdisjoint(required_roles):
                         return jsonify({'error': 'Insufficient permissions'}), 403
                 
                 # Get user from database
-                user_repository = UserRepository()
                 try:
-                    user = user_repository.get_by_keycloak_id(token_info['sub'])
+                    user = get_user_repository().get_by_keycloak_id(token_info['sub'])
                     # Store user in Flask's g object for access in the route
                     g.user = user
                 except Exception as e:
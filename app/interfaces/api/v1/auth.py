@@ -3,19 +3,117 @@ Authentication API endpoints.
 
 This module defines the authentication API endpoints.
 """
+import hashlib
+from functools import wraps
+from typing import Any, Callable, Dict
 from flask import request, jsonify, current_app
+from marshmallow import ValidationError as SchemaValidationError
+from app.core.cache import TTLCache
 from app.interfaces.api import api_bp
 from app.interfaces.serializers.auth import LoginSchema, RegisterSchema
 from app.application.use_cases.auth.login import LoginUseCase
 from app.application.use_cases.auth.register import RegisterUseCase
 from app.application.use_cases.auth.logout import LogoutUseCase
 from app.application.use_cases.auth.refresh_token import RefreshTokenUseCase
-from app.infrastructure.external.keycloak.auth_provider import KeycloakAuthProvider
-from app.infrastructure.database.repositories.user_repository import UserRepository
-from app.domain.exceptions import ValidationError, AuthenticationError
+from app.interfaces.api.middleware.auth import get_auth_provider, get_user_repository
+from app.domain.exceptions import ValidationError, AuthenticationError, InvalidCredentialsError
+
+# Schemas are stateless, so a single instance is shared across requests
+_login_schema = LoginSchema()
+_register_schema = RegisterSchema()
+
+
+# Refreshed tokens keyed by a digest of the refresh token, held until shortly before expiry
+_REFRESH_CACHE_TTL = 60
+_REFRESH_EXPIRY_SKEW = 30
+_refresh_cache = TTLCache(maxsize=10_000, ttl=_REFRESH_CACHE_TTL)
+
+
+def _refresh_cache_key(refresh_token: str) -> bytes:
+    """
+    Build the cache key for a refresh token.
+    
+    Args:
+        refresh_token: Refresh token
+        
+    Returns:
+        bytes: Digest of the refresh token
+    """
+    return hashlib.blake2b(refresh_token.encode('utf-8'), digest_size=16).digest()
+
+
+def _set_cached_refresh(key: bytes, result: Dict[str, Any]) -> None:
+    """
+    Cache tokens returned for a refresh token digest.
+    
+    Args:
+        key: Refresh token digest
+        result: Token response
+    """
+    ttl = _REFRESH_CACHE_TTL
+    expires_in = result.get('expires_in')
+    if expires_in is not None:
+        ttl = min(ttl, expires_in - _REFRESH_EXPIRY_SKEW)
+    _refresh_cache.set(key, result, ttl)
+
+
+# Per-client login attempt limit and short-lived cache of failed credentials. The state is
+# in-process, so the limit applies per worker process; clients are told apart by the address
+# ProxyFix resolves from PROXY_FIX_HOPS trusted proxies.
+_LOGIN_RATE_LIMIT = 10
+_LOGIN_RATE_WINDOW = 60
+_LOGIN_FAILURE_TTL = 30
+_login_attempts = TTLCache(maxsize=10_000, ttl=_LOGIN_RATE_WINDOW)
+_login_failures = TTLCache(maxsize=10_000, ttl=_LOGIN_FAILURE_TTL)
+
+
+def _login_failure_key(username: str, password: str) -> bytes:
+    """
+    Build the failure cache key for a set of credentials.
+    
+    Args:
+        username: Username
+        password: Password
+        
+    Returns:
+        bytes: Digest of the credentials
+    """
+    return hashlib.blake2b(f"{username}:{password}".encode('utf-8'), digest_size=16).digest()
+
+
+def _handle_auth_errors(action: str, auth_error_status: int = 401) -> Callable:
+    """
+    Decorator mapping auth endpoint exceptions to JSON error responses.
+    
+    Args:
+        action: Action name used when logging unexpected errors
+        auth_error_status: HTTP status returned for authentication errors
+    
+    Returns:
+        Callable: Decorator
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            try:
+                return f(*args, **kwargs)
+            except SchemaValidationError as e:
+                return jsonify({'error': 'Validation error', 'details': e.messages}), 400
+            except ValidationError as e:
+                return jsonify({'error': 'Validation error', 'details': e.errors}), 400
+            except AuthenticationError as e:
+                return jsonify({'error': str(e)}), auth_error_status
+            except Exception:
+                current_app.logger.exception("%s error", action)
+                return jsonify({'error': 'An unexpected error occurred'}), 500
+        
+        return decorated_function
+    
+    return decorator
 
 
 @api_bp.route('/v1/auth/login', methods=['POST'])
+@_handle_auth_errors('Login', auth_error_status=401)
 def login():
     """
     User login endpoint.
@@ -23,30 +121,31 @@ def login():
     Returns:
         JSON: Authentication tokens and user info
     """
+    if _login_attempts.incr(request.remote_addr or '') > _LOGIN_RATE_LIMIT:
+        return jsonify({'error': 'Too many login attempts, please try again later'}), 429
+    
+    # Validate request data
+    data = _login_schema.load(request.get_json() or {})
+    
+    # Reject credentials that just failed without another Keycloak round trip
+    failure_key = _login_failure_key(data['username'], data['password'])
+    if _login_failures.get(failure_key):
+        raise InvalidCredentialsError("Login failed: Invalid user credentials")
+    
+    # Create and execute use case
+    use_case = LoginUseCase(get_auth_provider(), get_user_repository())
     try:
-        # Validate request data
-        schema = LoginSchema()
-        data = schema.load(request.get_json() or {})
-        
-        # Create dependencies
-        auth_provider = KeycloakAuthProvider()
-        user_repository = UserRepository()
-        
-        # Create and execute use case
-        use_case = LoginUseCase(auth_provider, user_repository)
         result = use_case.execute(data['username'], data['password'])
-        
-        return jsonify(result), 200
-    except ValidationError as e:
-        return jsonify({'error': 'Validation error', 'details': e.errors}), 400
-    except AuthenticationError as e:
-        return jsonify({'error': str(e)}), 401
-    except Exception as e:
-        current_app.logger.error(f"Login error: {str(e)}")
-        return jsonify({'error': 'An unexpected error occurred'}), 500
+    except InvalidCredentialsError:
+        # Only Keycloak rejections are cached; outages must not lock valid credentials out
+        _login_failures.set(failure_key, True)
+        raise
+    
+    return jsonify(result), 200
 
 
 @api_bp.route('/v1/auth/register', methods=['POST'])
+@_handle_auth_errors('Registration', auth_error_status=400)
 def register():
     """
     User registration endpoint.
@@ -54,35 +153,24 @@ def register():
     Returns:
         JSON: Registration result with user ID
     """
-    try:
-        # Validate request data
-        schema = RegisterSchema()
-        data = schema.load(request.get_json() or {})
-        
-        # Create dependencies
-        auth_provider = KeycloakAuthProvider()
-        user_repository = UserRepository()
-        
-        # Create and execute use case
-        use_case = RegisterUseCase(auth_provider, user_repository)
-        result = use_case.execute(
-            data['email'],
-            data['password'],
-            data['first_name'],
-            data['last_name']
-        )
-        
-        return jsonify(result), 201
-    except ValidationError as e:
-        return jsonify({'error': 'Validation error', 'details': e.errors}), 400
-    except AuthenticationError as e:
-        return jsonify({'error': str(e)}), 400
-    except Exception as e:
-        current_app.logger.error(f"Registration error: {str(e)}")
-        return jsonify({'error': 'An unexpected error occurred'}), 500
+    # Validate request data
+    data = _register_schema.load(request.get_json() or {})
+    
+    # Create and execute use case, skipping checks RegisterSchema already made
+    use_case = RegisterUseCase(get_auth_provider(), get_user_repository())
+    result = use_case.execute(
+        data['email'],
+        data['password'],
+        data['first_name'],
+        data['last_name'],
+        prevalidated=True
+    )
+    
+    return jsonify(result), 201
 
 
 @api_bp.route('/v1/auth/logout', methods=['POST'])
+@_handle_auth_errors('Logout', auth_error_status=400)
 def logout():
     """
     User logout endpoint.
@@ -90,28 +178,22 @@ def logout():
     Returns:
         JSON: Success message
     """
-    try:
-        # Get request data
-        data = request.get_json() or {}
-        
-        # Create dependencies
-        auth_provider = KeycloakAuthProvider()
-        
-        # Create and execute use case
-        use_case = LogoutUseCase(auth_provider)
-        use_case.execute(data.get('refresh_token', ''))
-        
-        return jsonify({'message': 'Successfully logged out'}), 200
-    except ValidationError as e:
-        return jsonify({'error': 'Validation error', 'details': e.errors}), 400
-    except AuthenticationError as e:
-        return jsonify({'error': str(e)}), 400
-    except Exception as e:
-        current_app.logger.error(f"Logout error: {str(e)}")
-        return jsonify({'error': 'An unexpected error occurred'}), 500
+    # Get request data
+    data = request.get_json() or {}
+    
+    refresh_token = data.get('refresh_token', '')
+    
+    # Create and execute use case
+    use_case = LogoutUseCase(get_auth_provider())
+    use_case.execute(refresh_token)
+    
+    _refresh_cache.pop(_refresh_cache_key(refresh_token))
+    
+    return jsonify({'message': 'Successfully logged out'}), 200
 
 
 @api_bp.route('/v1/auth/refresh', methods=['POST'])
+@_handle_auth_errors('Token refresh', auth_error_status=401)
 def refresh_token():
     """
     Refresh token endpoint.
@@ -119,22 +201,23 @@ def refresh_token():
     Returns:
         JSON: New authentication tokens
     """
-    try:
-        # Get request data
-        data = request.get_json() or {}
-        
-        # Create dependencies
-        auth_provider = KeycloakAuthProvider()
-        
-        # Create and execute use case
-        use_case = RefreshTokenUseCase(auth_provider)
-        result = use_case.execute(data.get('refresh_token', ''))
-        
-        return jsonify(result), 200
-    except ValidationError as e:
-        return jsonify({'error': 'Validation error', 'details': e.errors}), 400
-    except AuthenticationError as e:
-        return jsonify({'error': str(e)}), 401
-    except Exception as e:
-        current_app.logger.error(f"Token refresh error: {str(e)}")
-        return jsonify({'error': 'An unexpected error occurred'}), 500
\ No newline at end of file
+    # Get request data
+    data = request.get_json() or {}
+    
+    token = data.get('refresh_token', '')
+    
+    # Serve repeat refreshes from the cache until the tokens near expiry
+    cache_key = _refresh_cache_key(token) if token else None
+    if cache_key is not None:
+        cached = _refresh_cache.get(cache_key)
+        if cached is not None:
+            return jsonify(cached), 200
+    
+    # Create and execute use case
+    use_case = RefreshTokenUseCase(get_auth_provider())
+    result = use_case.execute(token)
+    
+    if cache_key is not None:
+        _set_cached_refresh(cache_key, result)
+    
+    return jsonify(result), 200
@@ -3,8 +3,16 @@ Authentication serializers.
 
 This module defines serializers for authentication requests and responses.
 """
-from marshmallow import Schema, fields, validates, ValidationError
-import re
+from marshmallow import Schema, fields, validate, validates, ValidationError
+
+_SPECIAL_CHARS = frozenset('!@#$%^&*(),.?":{}|<>')
+
+# Character class flags collected by RegisterSchema.validate_password
+_HAS_DIGIT = 1
+_HAS_UPPER = 2
+_HAS_LOWER = 4
+_HAS_SPECIAL = 8
+_HAS_ALL = _HAS_DIGIT | _HAS_UPPER | _HAS_LOWER | _HAS_SPECIAL
 
 
 class LoginSchema(Schema):
@@ -19,8 +27,8 @@ class RegisterSchema(Schema):
     
     email = fields.Email(required=True)
     password = fields.String(required=True)
-    first_name = fields.String(required=True)
-    last_name = fields.String(required=True)
+    first_name = fields.String(required=True, validate=validate.Length(min=1))
+    last_name = fields.String(required=True, validate=validate.Length(min=1))
     
     @validates('password')
     def validate_password(self, value):
@@ -28,16 +36,30 @@ class RegisterSchema(Schema):
         if len(value) < 8:
             raise ValidationError('Password must be at least 8 characters long')
         
-        if not any(char.isdigit() for char in value):
+        # Collect the character classes present in a single pass
+        flags = 0
+        for char in value:
+            if char.isdigit():
+                flags |= _HAS_DIGIT
+            elif char.isupper():
+                flags |= _HAS_UPPER
+            elif char.islower():
+                flags |= _HAS_LOWER
+            elif char in _SPECIAL_CHARS:
+                flags |= _HAS_SPECIAL
+            if flags == _HAS_ALL:
+                return
+        
+        if not flags & _HAS_DIGIT:
             raise ValidationError('Password must contain at least one digit')
         
-        if not any(char.isupper() for char in value):
+        if not flags & _HAS_UPPER:
             raise ValidationError('Password must contain at least one uppercase letter')
         
-        if not any(char.islower() for char in value):
+        if not flags & _HAS_LOWER:
             raise ValidationError('Password must contain at least one lowercase letter')
         
-        if not re.search(r'[!@#$%^&*(),.?":{}|<>]', value):
+        if not flags & _HAS_SPECIAL:
             raise ValidationError('Password must contain at least one special character')
 
 
@@ -2,6 +2,7 @@
 Order model module.
 """
 from datetime import datetime
+from sqlalchemy import func
 from app import db
 
 class OrderStatus:
@@ -12,10 +13,20 @@ class OrderStatus:
     DELIVERED = 'delivered'
     CANCELLED = 'cancelled'
     
+    _ALL = (PENDING, PROCESSING, SHIPPED, DELIVERED, CANCELLED)
+    _VALID = frozenset(_ALL)
+    # Comma separated list of statuses for error messages
+    CHOICES = ', '.join(_ALL)
+    
     @classmethod
     def all(cls):
         """Get all valid statuses."""
-        return [cls.PENDING, cls.PROCESSING, cls.SHIPPED, cls.DELIVERED, cls.CANCELLED]
+        return list(cls._ALL)
+    
+    @classmethod
+    def valid(cls, status):
+        """Check if a status is valid."""
+        return status in cls._VALID
 
 
 class Order(db.Model):
@@ -34,7 +45,7 @@ class Order(db.Model):
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
-    items = db.relationship('OrderItem', backref='order', lazy='joined', cascade='all, delete-orphan')
+    items = db.relationship('OrderItem', backref='order', lazy='select', cascade='all, delete-orphan')
     
     def __repr__(self):
         return f'<Order {self.id}>'
@@ -53,12 +64,12 @@ class Order(db.Model):
             'id': self.id,
             'user_id': self.user_id,
             'status': self.status,
-            'total_amount': float(self.total_amount),
+            'total_amount': self.total_amount,
             'shipping_address': self.shipping_address,
             'tracking_number': self.tracking_number,
             'notes': self.notes,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat()
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
         }
         
         if include_items:
@@ -68,7 +79,13 @@ class Order(db.Model):
     
     def calculate_total(self):
         """Calculate total amount from order items."""
-        self.total_amount = sum(item.price * item.quantity for item in self.items)
+        if self.id is None:
+            # Items are not persisted yet, so sum them in Python
+            self.total_amount = sum(item.price * item.quantity for item in self.items)
+        else:
+            self.total_amount = db.session.query(
+                func.coalesce(func.sum(OrderItem.price * OrderItem.quantity), 0)
+            ).filter(OrderItem.order_id == self.id).scalar()
         return self.total_amount
 
 
@@ -93,6 +110,6 @@ class OrderItem(db.Model):
             'order_id': self.order_id,
             'product_id': self.product_id,
             'quantity': self.quantity,
-            'price': float(self.price),
-            'subtotal': float(self.price * self.quantity)
+            'price': self.price,
+            'subtotal': self.price * self.quantity
         }
\ No newline at end of file
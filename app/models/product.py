@@ -2,6 +2,7 @@
 Product model module.
 """
 from datetime import datetime
+from sqlalchemy import case, update
 from app import db
 
 class Product(db.Model):
@@ -21,7 +22,7 @@ class Product(db.Model):
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
-    order_items = db.relationship('OrderItem', backref='product', lazy='dynamic')
+    order_items = db.relationship('OrderItem', backref='product', lazy='select')
     
     def __repr__(self):
         return f'<Product {self.name}>'
@@ -32,13 +33,13 @@ class Product(db.Model):
             'id': self.id,
             'name': self.name,
             'description': self.description,
-            'price': float(self.price),
+            'price': self.price,
             'image_url': self.image_url,
             'stock': self.stock,
             'sku': self.sku,
             'is_active': self.is_active,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat()
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
         }
     
     def update_stock(self, quantity):
@@ -55,4 +56,27 @@ class Product(db.Model):
             return False
         
         self.stock += quantity
-        return True
\ No newline at end of file
+        return True
+    
+    @classmethod
+    def reserve_stock(cls, quantities):
+        """
+        Atomically decrement stock for several products in one UPDATE.
+        
+        Products without enough stock are left untouched, so concurrent
+        orders cannot oversell a product.
+        
+        Args:
+            quantities (dict): Quantity to reserve by product ID
+            
+        Returns:
+            set: IDs of the products whose stock was reserved
+        """
+        quantity = case(quantities, value=cls.id)
+        return set(db.session.execute(
+            update(cls)
+            .where(cls.id.in_(quantities), cls.stock >= quantity)
+            .values(stock=cls.stock - quantity)
+            .returning(cls.id)
+            .execution_options(synchronize_session=False)
+        ).scalars())
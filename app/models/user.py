@@ -74,6 +74,7 @@
 User model module.
 """
 from datetime import datetime
+from sqlalchemy.ext.hybrid import hybrid_property
 from app import db
 
 class User(db.Model):
@@ -91,15 +92,20 @@ class User(db.Model):
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
-    orders = db.relationship('Order', backref='user', lazy='dynamic', cascade='all, delete-orphan')
+    orders = db.relationship('Order', backref='user', lazy='select', cascade='all, delete-orphan')
     
     def __repr__(self):
         return f'<User {self.email}>'
     
-    @property
+    @hybrid_property
     def full_name(self):
-        """Get user's full name."""
-        return f"{self.first_name} {self.last_name}"
+        """Get user's full name, skipping missing parts."""
+        return ' '.join(part for part in (self.first_name, self.last_name) if part)
+    
+    @full_name.expression
+    def full_name(cls):
+        """SQL expression for the full name, so queries can filter and sort on it."""
+        return db.func.trim(db.func.coalesce(cls.first_name, '') + ' ' + db.func.coalesce(cls.last_name, ''))
     
     def to_dict(self):
         """Convert user to dictionary."""
@@ -111,6 +117,6 @@ class User(db.Model):
             'last_name': self.last_name,
             'full_name': self.full_name,
             'is_active': self.is_active,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat()
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
         }
\ No newline at end of file
@@ -1,55 +1,114 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, abort
+from sqlalchemy import func, select, text, update
+from sqlalchemy.orm import selectinload, joinedload
 from app import db
-from app.models import Order, OrderItem, Product, User
-from app.utils.security import token_required
+from app.core.json_provider import negotiated_response
+from app.core.pagination import encode_cursor, keyset_filter, keyset_order
+from app.models import Order, OrderItem, Product
+from app.utils.helpers import get_pagination_params
+from app.utils.security import token_required, get_current_user_id
 
 bp = Blueprint('orders', __name__)
 
+# Columns returned by the order listing
+_ORDER_LIST_COLS = (
+    Order.id,
+    Order.user_id,
+    Order.status,
+    Order.total_amount,
+    Order.created_at,
+    Order.updated_at,
+)
+_ORDER_ITEM_LIST_COLS = (
+    OrderItem.id,
+    OrderItem.order_id,
+    OrderItem.product_id,
+    OrderItem.quantity,
+    OrderItem.price,
+)
+
+# Inserts an order and all its items in one round trip (PostgreSQL only)
+_INSERT_ORDER_SQL = text("""
+    WITH new_order AS (
+        INSERT INTO orders (user_id, status, total_amount, created_at, updated_at)
+        VALUES (:user_id, 'pending', :total_amount, timezone('utc', now()), timezone('utc', now()))
+        RETURNING id
+    )
+    INSERT INTO order_items (order_id, product_id, quantity, price)
+    SELECT new_order.id, item.product_id, item.quantity, item.price
+    FROM new_order, unnest(
+        CAST(:product_ids AS integer[]),
+        CAST(:quantities AS integer[]),
+        CAST(:prices AS numeric[])
+    ) AS item(product_id, quantity, price)
+    RETURNING order_id
+""")
+
 @bp.route('/', methods=['GET'])
 @token_required()
 def get_orders(current_user):
-    page = request.args.get('page', 1, type=int)
-    per_page = request.args.get('per_page', 10, type=int)
+    page, per_page = get_pagination_params()
+    # Cursor paging is opt-in: pass cursor (empty for the first page) to use it
+    cursor = request.args.get('cursor')
     
     # Regular users can only see their own orders
     # Admins can see all orders
-    if 'admin' in current_user.get('roles', []):
-        orders = Order.query.paginate(page=page, per_page=per_page)
+    conditions = []
+    if 'admin' not in current_user.get('roles', []):
+        conditions.append(Order.user_id == get_current_user_id(current_user))
+    
+    # Read-only listing: select plain rows instead of hydrating ORM objects
+    stmt = select(*_ORDER_LIST_COLS).where(*conditions).order_by(*keyset_order(Order.created_at, Order.id))
+    
+    if cursor is None:
+        total = db.session.execute(select(func.count(Order.id)).where(*conditions)).scalar()
+        rows = db.session.execute(stmt.limit(per_page).offset((page - 1) * per_page)).mappings().all()
+        meta = {'total': total, 'pages': -(-total // per_page), 'page': page}
     else:
-        user = User.query.filter_by(keycloak_id=current_user['sub']).first_or_404()
-        orders = Order.query.filter_by(user_id=user.id).paginate(page=page, per_page=per_page)
+        if cursor:
+            try:
+                stmt = stmt.where(keyset_filter(Order.created_at, Order.id, cursor))
+            except ValueError:
+                return jsonify({'error': 'Invalid cursor'}), 400
+        rows = db.session.execute(stmt.limit(per_page + 1)).mappings().all()
+        next_cursor = None
+        if len(rows) > per_page:
+            rows = rows[:per_page]
+            next_cursor = encode_cursor(rows[-1]['created_at'], rows[-1]['id'])
+        meta = {'next_cursor': next_cursor}
     
-    result = {
-        'items': [{
-            'id': order.id,
-            'user_id': order.user_id,
-            'status': order.status,
-            'total_amount': order.total_amount,
-            'created_at': order.created_at.isoformat(),
-            'updated_at': order.updated_at.isoformat(),
-            'items': [{
-                'id': item.id,
-                'product_id': item.product_id,
-                'quantity': item.quantity,
-                'price': item.price
-            } for item in order.items]
-        } for order in orders.items],
-        'total': orders.total,
-        'pages': orders.pages,
-        'page': page
-    }
+    # Fetch the items of all listed orders in one query
+    items_by_order = {row['id']: [] for row in rows}
+    if items_by_order:
+        item_rows = db.session.execute(
+            select(*_ORDER_ITEM_LIST_COLS).where(OrderItem.order_id.in_(items_by_order))
+        ).mappings()
+        for item in item_rows:
+            items_by_order[item['order_id']].append({
+                'id': item['id'],
+                'product_id': item['product_id'],
+                'quantity': item['quantity'],
+                'price': item['price']
+            })
     
-    return jsonify(result), 200
+    orders = []
+    for row in rows:
+        order = dict(row)
+        order['items'] = items_by_order[row['id']]
+        orders.append(order)
+    
+    return negotiated_response({'items': orders, **meta})
 
 @bp.route('/<int:id>', methods=['GET'])
 @token_required()
 def get_order(id, current_user):
-    order = Order.query.get_or_404(id)
+    order = Order.query.options(
+        selectinload(Order.items).joinedload(OrderItem.product)
+    ).get_or_404(id)
     
     # Check if the user is authorized to view this order
     if 'admin' not in current_user.get('roles', []):
-        user = User.query.filter_by(keycloak_id=current_user['sub']).first_or_404()
-        if order.user_id != user.id:
+        if order.user_id != get_current_user_id(current_user):
             return jsonify({'error': 'Unauthorized'}), 403
     
     result = {
@@ -57,8 +116,8 @@ def get_order(id, current_user):
         'user_id': order.user_id,
         'status': order.status,
         'total_amount': order.total_amount,
-        'created_at': order.created_at.isoformat(),
-        'updated_at': order.updated_at.isoformat(),
+        'created_at': order.created_at,
+        'updated_at': order.updated_at,
         'items': [{
             'id': item.id,
             'product_id': item.product_id,
@@ -70,6 +129,63 @@ def get_order(id, current_user):
     
     return jsonify(result), 200
 
+def _insert_order(user_id, total_amount, order_items):
+    """
+    Insert a pending order together with its items.
+    
+    On PostgreSQL the order and all items are written by one statement;
+    other databases fall back to a flush followed by a bulk insert.
+    
+    Args:
+        user_id (int): ID of the ordering user
+        total_amount (Decimal): Order total
+        order_items (list): Item mappings with product_id, quantity and price
+        
+    Returns:
+        int: ID of the new order
+    """
+    if db.session.get_bind().dialect.name == 'postgresql':
+        return db.session.execute(_INSERT_ORDER_SQL, {
+            'user_id': user_id,
+            'total_amount': total_amount,
+            'product_ids': [item['product_id'] for item in order_items],
+            'quantities': [item['quantity'] for item in order_items],
+            'prices': [item['price'] for item in order_items]
+        }).scalars().first()
+    
+    order = Order(
+        user_id=user_id,
+        status='pending',
+        total_amount=total_amount
+    )
+    
+    db.session.add(order)
+    db.session.flush()  # Get the order ID
+    
+    for item_data in order_items:
+        item_data['order_id'] = order.id
+    db.session.bulk_insert_mappings(OrderItem, order_items)
+    
+    return order.id
+
+def _positive_int(value):
+    """
+    Coerce a JSON value to a positive integer.
+    
+    Args:
+        value: Integer or string of digits from the request body
+        
+    Returns:
+        int: The value, or None if it is not a positive integer
+    """
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, str) and value.strip().isdigit():
+        value = int(value)
+    if not isinstance(value, int) or value <= 0:
+        return None
+    return value
+
 @bp.route('/', methods=['POST'])
 @token_required()
 def create_order(current_user):
@@ -78,65 +194,73 @@ def create_order(current_user):
     if not data or 'items' not in data or not data['items']:
         return jsonify({'error': 'Order items are required'}), 400
     
+    items = []
+    for item_data in data['items']:
+        if not isinstance(item_data, dict) or 'product_id' not in item_data or 'quantity' not in item_data:
+            return jsonify({'error': 'Product ID and quantity are required for each item'}), 400
+        
+        # Product IDs are matched against integer keys below, so coerce them up front
+        product_id = _positive_int(item_data['product_id'])
+        quantity = _positive_int(item_data['quantity'])
+        if product_id is None or quantity is None:
+            return jsonify({'error': 'Product ID and quantity must be positive integers'}), 400
+        items.append({'product_id': product_id, 'quantity': quantity})
+    
     # Get the user
-    user = User.query.filter_by(keycloak_id=current_user['sub']).first_or_404()
+    user_id = get_current_user_id(current_user)
+    
+    # Fetch the ordered products' id, name and price in a single query
+    requested = {}
+    for item_data in items:
+        requested[item_data['product_id']] = requested.get(item_data['product_id'], 0) + item_data['quantity']
+    
+    products = {
+        product.id: product
+        for product in db.session.execute(
+            select(Product.id, Product.name, Product.price).where(Product.id.in_(requested))
+        )
+    }
+    if len(products) != len(requested):
+        abort(404)
     
     # Validate items and calculate total
     total_amount = 0
     order_items = []
     
-    for item_data in data['items']:
-        if 'product_id' not in item_data or 'quantity' not in item_data:
-            return jsonify({'error': 'Product ID and quantity are required for each item'}), 400
-        
-        product = Product.query.get_or_404(item_data['product_id'])
-        
-        if product.stock < item_data['quantity']:
-            return jsonify({'error': f'Not enough stock for product {product.name}'}), 400
+    for item_data in items:
+        product = products[item_data['product_id']]
         
         # Calculate item price
         item_price = product.price * item_data['quantity']
         total_amount += item_price
         
-        # Create order item
         order_items.append({
             'product_id': product.id,
             'quantity': item_data['quantity'],
             'price': product.price
         })
-        
-        # Update product stock
-        product.stock -= item_data['quantity']
     
-    # Create order
-    order = Order(
-        user_id=user.id,
-        status='pending',
-        total_amount=total_amount
-    )
+    # Reserve stock atomically; products without enough stock are left untouched
+    reserved = Product.reserve_stock(requested)
     
-    db.session.add(order)
-    db.session.flush()  # Get the order ID
-    
-    # Create order items
-    for item_data in order_items:
-        order_item = OrderItem(
-            order_id=order.id,
-            product_id=item_data['product_id'],
-            quantity=item_data['quantity'],
-            price=item_data['price']
-        )
-        db.session.add(order_item)
+    if len(reserved) != len(requested):
+        product = next(products[product_id] for product_id in requested if product_id not in reserved)
+        db.session.rollback()
+        return jsonify({'error': f'Not enough stock for product {product.name}'}), 400
     
+    # Create order and order items
+    order_id = _insert_order(user_id, total_amount, order_items)
     db.session.commit()
     
+    order = Order.query.options(selectinload(Order.items)).get(order_id)
+    
     result = {
         'id': order.id,
         'user_id': order.user_id,
         'status': order.status,
         'total_amount': order.total_amount,
-        'created_at': order.created_at.isoformat(),
-        'updated_at': order.updated_at.isoformat(),
+        'created_at': order.created_at,
+        'updated_at': order.updated_at,
         'items': [{
             'id': item.id,
             'product_id': item.product_id,
@@ -162,9 +286,20 @@ def update_order_status(id, current_user):
     
     # If cancelling an order, restore product stock
     if data['status'] == 'cancelled' and order.status != 'cancelled':
-        for item in order.items:
-            product = Product.query.get(item.product_id)
-            product.stock += item.quantity
+        # One UPDATE for all products; the correlated sum also covers repeated products
+        # and works on both PostgreSQL and SQLite
+        order_items = OrderItem.__table__
+        restored = (
+            select(func.sum(order_items.c.quantity))
+            .where(order_items.c.order_id == order.id, order_items.c.product_id == Product.id)
+            .scalar_subquery()
+        )
+        db.session.execute(
+            update(Product)
+            .where(Product.id.in_(select(order_items.c.product_id).where(order_items.c.order_id == order.id)))
+            .values(stock=Product.stock + restored)
+            .execution_options(synchronize_session=False)
+        )
     
     order.status = data['status']
     db.session.commit()
@@ -174,8 +309,8 @@ def update_order_status(id, current_user):
         'user_id': order.user_id,
         'status': order.status,
         'total_amount': order.total_amount,
-        'created_at': order.created_at.isoformat(),
-        'updated_at': order.updated_at.isoformat()
+        'created_at': order.created_at,
+        'updated_at': order.updated_at
     }
     
     return jsonify(result), 200
\ No newline at end of file
@@ -1,16 +1,31 @@
 from flask import Blueprint, request, jsonify
 from app import db
+from app.core.json_provider import negotiated_response
+from app.core.pagination import keyset_order, keyset_paginate
 from app.models import Product
+from app.utils.helpers import get_pagination_params
 from app.utils.security import token_required
 
 bp = Blueprint('products', __name__)
 
 @bp.route('/', methods=['GET'])
 def get_products():
-    page = request.args.get('page', 1, type=int)
-    per_page = request.args.get('per_page', 10, type=int)
-    
-    products = Product.query.paginate(page=page, per_page=per_page)
+    page, per_page = get_pagination_params()
+    # Cursor paging is opt-in: pass cursor (empty for the first page) to use it
+    cursor = request.args.get('cursor')
+    
+    if cursor is None:
+        products = Product.query.order_by(
+            *keyset_order(Product.created_at, Product.id)
+        ).paginate(page=page, per_page=per_page)
+        items = products.items
+        meta = {'total': products.total, 'pages': products.pages, 'page': page}
+    else:
+        try:
+            items, next_cursor = keyset_paginate(Product.query, Product, per_page, cursor)
+        except ValueError:
+            return jsonify({'error': 'Invalid cursor'}), 400
+        meta = {'next_cursor': next_cursor}
     
     result = {
         'items': [{
@@ -20,15 +35,13 @@ def get_products():
             'price': product.price,
             'image_url': product.image_url,
             'stock': product.stock,
-            'created_at': product.created_at.isoformat(),
-            'updated_at': product.updated_at.isoformat()
-        } for product in products.items],
-        'total': products.total,
-        'pages': products.pages,
-        'page': page
+            'created_at': product.created_at,
+            'updated_at': product.updated_at
+        } for product in items],
+        **meta
     }
     
-    return jsonify(result), 200
+    return negotiated_response(result)
 
 @bp.route('/<int:id>', methods=['GET'])
 def get_product(id):
@@ -41,8 +54,8 @@ def get_product(id):
         'price': product.price,
         'image_url': product.image_url,
         'stock': product.stock,
-        'created_at': product.created_at.isoformat(),
-        'updated_at': product.updated_at.isoformat()
+        'created_at': product.created_at,
+        'updated_at': product.updated_at
     }
     
     return jsonify(result), 200
@@ -75,8 +88,8 @@ def create_product():
         'price': product.price,
         'image_url': product.image_url,
         'stock': product.stock,
-        'created_at': product.created_at.isoformat(),
-        'updated_at': product.updated_at.isoformat()
+        'created_at': product.created_at,
+        'updated_at': product.updated_at
     }
     
     return jsonify(result), 201
@@ -107,8 +120,8 @@ def update_product(id):
         'price': product.price,
         'image_url': product.image_url,
         'stock': product.stock,
-        'created_at': product.created_at.isoformat(),
-        'updated_at': product.updated_at.isoformat()
+        'created_at': product.created_at,
+        'updated_at': product.updated_at
     }
     
     return jsonify(result), 200
@@ -1,35 +1,70 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, abort
 from app import db
 from app.models import User
 from app.services.keycloak import KeycloakService
-from app.utils.security import token_required
+from app.core.json_provider import json_response
+from app.core.pagination import keyset_order, keyset_paginate
+from app.utils.helpers import get_pagination_params
+from app.utils.security import token_required, current_user_by_kc_id
 
 bp = Blueprint('users', __name__)
 
+# Profile fields that are mirrored to Keycloak, as (column, Keycloak attribute)
+_KEYCLOAK_FIELDS = (('first_name', 'firstName'), ('last_name', 'lastName'))
+
+# Columns needed for the user list; selecting them directly skips ORM instance construction
+_USER_LIST_COLS = (
+    User.id, User.keycloak_id, User.email, User.first_name,
+    User.last_name, User.created_at, User.updated_at,
+)
+
+
+def _serialize_user(user):
+    """
+    Convert a user to the response payload.
+    
+    Args:
+        user (User|Row): User object or a row of _USER_LIST_COLS
+        
+    Returns:
+        dict: User payload
+    """
+    return {
+        'id': user.id,
+        'keycloak_id': user.keycloak_id,
+        'email': user.email,
+        'first_name': user.first_name,
+        'last_name': user.last_name,
+        'created_at': user.created_at,
+        'updated_at': user.updated_at
+    }
+
 @bp.route('/', methods=['GET'])
 @token_required(roles=['admin'])
 def get_users():
-    page = request.args.get('page', 1, type=int)
-    per_page = request.args.get('per_page', 10, type=int)
+    page, per_page = get_pagination_params()
+    # Cursor paging is opt-in: pass cursor (empty for the first page) to use it
+    cursor = request.args.get('cursor')
     
-    users = User.query.paginate(page=page, per_page=per_page)
+    if cursor is None:
+        users = db.session.query(*_USER_LIST_COLS).order_by(
+            *keyset_order(User.created_at, User.id)
+        ).paginate(page=page, per_page=per_page)
+        items = users.items
+        meta = {'total': users.total, 'pages': users.pages, 'page': page}
+    else:
+        try:
+            items, next_cursor = keyset_paginate(db.session.query(*_USER_LIST_COLS), User, per_page, cursor)
+        except ValueError:
+            return jsonify({'error': 'Invalid cursor'}), 400
+        meta = {'next_cursor': next_cursor}
     
     result = {
-        'items': [{
-            'id': user.id,
-            'keycloak_id': user.keycloak_id,
-            'email': user.email,
-            'first_name': user.first_name,
-            'last_name': user.last_name,
-            'created_at': user.created_at.isoformat(),
-            'updated_at': user.updated_at.isoformat()
-        } for user in users.items],
-        'total': users.total,
-        'pages': users.pages,
-        'page': page
+        'items': [_serialize_user(user) for user in items],
+        **meta
     }
     
-    return jsonify(result), 200
+    return json_response(result)
 
 @bp.route('/<int:id>', methods=['GET'])
 @token_required()
@@ -38,73 +73,46 @@ def get_user(id, current_user):
     
     # Regular users can only view their own profile
     # Admins can view any profile
-    if 'admin' not in current_user.get('roles', []):
-        db_user = User.query.filter_by(keycloak_id=current_user['sub']).first_or_404()
-        if user.id != db_user.id:
-            return jsonify({'error': 'Unauthorized'}), 403
-    
-    result = {
-        'id': user.id,
-        'keycloak_id': user.keycloak_id,
-        'email': user.email,
-        'first_name': user.first_name,
-        'last_name': user.last_name,
-        'created_at': user.created_at.isoformat(),
-        'updated_at': user.updated_at.isoformat()
-    }
+    if 'admin' not in current_user.get('roles', []) and user.keycloak_id != current_user['sub']:
+        return jsonify({'error': 'Unauthorized'}), 403
     
-    return jsonify(result), 200
+    return json_response(_serialize_user(user))
 
 @bp.route('/me', methods=['GET'])
 @token_required()
 def get_current_user(current_user):
-    user = User.query.filter_by(keycloak_id=current_user['sub']).first_or_404()
+    user = current_user_by_kc_id(current_user['sub'])
+    if user is None:
+        abort(404)
     
-    result = {
-        'id': user.id,
-        'keycloak_id': user.keycloak_id,
-        'email': user.email,
-        'first_name': user.first_name,
-        'last_name': user.last_name,
-        'created_at': user.created_at.isoformat(),
-        'updated_at': user.updated_at.isoformat()
-    }
-    
-    return jsonify(result), 200
+    return json_response(_serialize_user(user))
 
 @bp.route('/me', methods=['PUT'])
 @token_required()
 def update_current_user(current_user):
-    user = User.query.filter_by(keycloak_id=current_user['sub']).first_or_404()
+    user = current_user_by_kc_id(current_user['sub'])
+    if user is None:
+        abort(404)
     data = request.get_json()
     
-    # Update user in database
-    if 'first_name' in data:
-        user.first_name = data['first_name']
-    if 'last_name' in data:
-        user.last_name = data['last_name']
-    
-    db.session.commit()
-    
-    # Update user in Keycloak if needed
+    # Apply changes to the database row and collect the Keycloak equivalents in one pass
     keycloak_updates = {}
-    if 'first_name' in data:
-        keycloak_updates['firstName'] = data['first_name']
-    if 'last_name' in data:
-        keycloak_updates['lastName'] = data['last_name']
+    for field, keycloak_field in _KEYCLOAK_FIELDS:
+        if field in data and data[field] != getattr(user, field):
+            setattr(user, field, data[field])
+            keycloak_updates[keycloak_field] = data[field]
     
-    if keycloak_updates:
-        keycloak_service = KeycloakService()
-        keycloak_service.update_user(user.keycloak_id, keycloak_updates)
+    # Nothing changed: skip the write transaction and the Keycloak call
+    if not keycloak_updates:
+        return json_response(_serialize_user(user))
     
-    result = {
-        'id': user.id,
-        'keycloak_id': user.keycloak_id,
-        'email': user.email,
-        'first_name': user.first_name,
-        'last_name': user.last_name,
-        'created_at': user.created_at.isoformat(),
-        'updated_at': user.updated_at.isoformat()
-    }
+    # Update Keycloak before committing so a failure there leaves the database untouched
+    try:
+        KeycloakService().update_user(user.keycloak_id, keycloak_updates)
+    except Exception:
+        db.session.rollback()
+        raise
+    
+    db.session.commit()
     
-    return jsonify(result), 200
\ No newline at end of file
+    return json_response(_serialize_user(user))
\ No newline at end of file
@@ -1,12 +1,39 @@
 """
 Authentication service.
 """
+import hashlib
+import threading
+import time
+import jwt
 from flask import current_app
-from keycloak import KeycloakOpenID, KeycloakAdmin
 from app import db
 from app.models import User
+from app.services.keycloak_clients import get_keycloak_clients
+from app.core.cache import TTLCache
 from app.core.exceptions import AuthenticationError
 
+# Introspection results keyed by token hash, never kept past the token's own expiry
+_INTROSPECTION_CACHE_TTL = 300
+_introspection_cache = TTLCache(maxsize=10000, ttl=_INTROSPECTION_CACHE_TTL)
+# Realm signing keys by key ID, fetched from the JWKS endpoint at most once per interval.
+# The keys dict is replaced as a whole, so readers never need the lock.
+_JWKS_REFRESH_INTERVAL = 60
+_jwks = {'keys': {}, 'fetched_at': None}
+_jwks_lock = threading.Lock()
+
+
+def _token_key(token):
+    """
+    Build the cache key for a token.
+    
+    Args:
+        token (str): JWT token
+        
+    Returns:
+        bytes: 16 byte BLAKE2b digest of the token
+    """
+    return hashlib.blake2b(token.encode('utf-8'), digest_size=16).digest()
+
 class AuthService:
     """Service for authentication operations."""
     
@@ -16,23 +43,12 @@ class AuthService:
         self.realm = current_app.config['KEYCLOAK_REALM']
         self.client_id = current_app.config['KEYCLOAK_CLIENT_ID']
         self.client_secret = current_app.config['KEYCLOAK_CLIENT_SECRET']
+        # Tokens carry the issuer of the hostname they were obtained through
+        self.issuer = (current_app.config.get('KEYCLOAK_ISSUER')
+                       or f"{self.server_url.rstrip('/')}/realms/{self.realm}")
         
-        # Initialize Keycloak OpenID client
-        self.keycloak_openid = KeycloakOpenID(
-            server_url=self.server_url,
-            client_id=self.client_id,
-            realm_name=self.realm,
-            client_secret_key=self.client_secret
-        )
-        
-        # Initialize Keycloak Admin client
-        self.keycloak_admin = KeycloakAdmin(
-            server_url=self.server_url,
-            realm_name=self.realm,
-            client_id=self.client_id,
-            client_secret_key=self.client_secret,
-            verify=True
-        )
+        # Reuse the application's Keycloak clients and their connection pools
+        self.keycloak_openid, self.keycloak_admin = get_keycloak_clients()
     
     def login(self, username, password):
         """
@@ -87,6 +103,9 @@ class AuthService:
         """
         Logout a user from Keycloak.
         
+        This ends the Keycloak session. Access tokens are verified locally,
+        so ones already issued stay valid until their exp claim.
+        
         Args:
             refresh_token (str): Refresh token
             
@@ -181,7 +200,7 @@ class AuthService:
             dict: Token info or None if invalid
         """
         try:
-            return self.keycloak_openid.introspect(token)
+            return self._introspect(token)
         except Exception as e:
             current_app.logger.error(f"Token validation error: {str(e)}")
             return None
@@ -197,7 +216,127 @@ class AuthService:
             list: User roles
         """
         try:
-            token_info = self.keycloak_openid.introspect(token)
+            token_info = self._introspect(token)
             return token_info.get('realm_access', {}).get('roles', [])
         except Exception:
-            return []
\ No newline at end of file
+            return []
+    
+    def _introspect(self, token):
+        """
+        Validate a token, reusing cached results for active tokens.
+        
+        Tokens are verified against the realm signing keys instead of the
+        Keycloak introspection endpoint, so no request is made per token.
+        
+        Args:
+            token (str): JWT token
+            
+        Returns:
+            dict: Token info
+        """
+        key = _token_key(token)
+        token_info = _introspection_cache.get(key)
+        if token_info is not None:
+            return token_info
+        
+        token_info = self._verify_locally(token)
+        
+        # Only active tokens are cached, and never beyond their exp claim
+        if token_info.get('active') and token_info.get('exp'):
+            ttl = min(token_info['exp'] - time.time(), _INTROSPECTION_CACHE_TTL)
+            _introspection_cache.set(key, token_info, ttl)
+        
+        return token_info
+    
+    def _verify_locally(self, token):
+        """
+        Verify a token signature and claims with the realm's public keys.
+        
+        Args:
+            token (str): JWT token
+            
+        Returns:
+            dict: Token claims with 'active' set, or {'active': False} if invalid
+        """
+        try:
+            kid = jwt.get_unverified_header(token).get('kid')
+            try:
+                claims = self._decode(token, self._get_signing_key(kid))
+            except jwt.InvalidSignatureError:
+                # The realm keys may have rotated; refetch them (rate limited) and retry
+                claims = self._decode(token, self._get_signing_key(kid, refresh=True))
+        except jwt.PyJWTError:
+            return {'active': False}
+        
+        # Only access tokens issued to this client are accepted; ID tokens carry typ 'ID'
+        if claims.get('typ') != 'Bearer' or claims.get('azp', self.client_id) != self.client_id:
+            return {'active': False}
+        
+        claims['active'] = True
+        return claims
+    
+    def _decode(self, token, key):
+        """
+        Decode a token and check its signature, expiry and issuer.
+        
+        Args:
+            token (str): JWT token
+            key: Realm public key
+            
+        Returns:
+            dict: Token claims
+            
+        Raises:
+            jwt.PyJWTError: If the token is invalid
+        """
+        return jwt.decode(
+            token,
+            key,
+            algorithms=['RS256'],
+            issuer=self.issuer,
+            options={'verify_aud': False, 'require': ['exp', 'sub', 'iss']}
+        )
+    
+    def _get_signing_key(self, kid, refresh=False):
+        """
+        Get the realm public key for a key ID.
+        
+        Args:
+            kid (str): Key ID from the token header
+            refresh (bool): Whether to refetch the JWKS even on a cache hit
+            
+        Returns:
+            Key object usable by jwt.decode
+            
+        Raises:
+            jwt.InvalidKeyError: If the realm has no key with this ID
+        """
+        key = None if refresh else _jwks['keys'].get(kid)
+        if key is None:
+            self._refresh_signing_keys()
+            key = _jwks['keys'].get(kid)
+        if key is None:
+            raise jwt.InvalidKeyError(f"Unknown signing key: {kid}")
+        return key
+    
+    def _refresh_signing_keys(self):
+        """
+        Refetch the realm JWKS unless it was fetched within the refresh interval.
+        
+        Forged signatures and unknown key IDs therefore cost at most one
+        Keycloak request per interval, and the fetch never holds a lock.
+        """
+        now = time.monotonic()
+        with _jwks_lock:
+            fetched_at = _jwks['fetched_at']
+            if fetched_at is not None and now - fetched_at < _JWKS_REFRESH_INTERVAL:
+                return
+            # Claim the refresh so concurrent callers keep using the current keys
+            _jwks['fetched_at'] = now
+        
+        try:
+            jwks = jwt.PyJWKSet.from_dict(self.keycloak_openid.certs())
+        except Exception as e:
+            current_app.logger.error(f"JWKS fetch error: {str(e)}")
+            return
+        _jwks['keys'] = {jwk.key_id: jwk.key for jwk in jwks.keys}
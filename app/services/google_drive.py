@@ -4,6 +4,74 @@ from googleapiclient.discovery import build
 from googleapiclient.http import MediaFileUpload
 from google.oauth2 import service_account
 
+# Resumable uploads are sent in chunks of this size, bounding memory per upload
+UPLOAD_CHUNK_SIZE = 10 * 1024 * 1024
+
+# Maximum number of calls Drive accepts in one batch request
+DRIVE_BATCH_MAX = 100
+
+def public_permission(service, file_id):
+    """
+    Build a request making a file readable by anyone with the link
+    
+    Args:
+        service: Google Drive API client
+        file_id (str): ID of the file
+    
+    Returns:
+        HttpRequest: Pending permissions().create request
+    """
+    return service.permissions().create(
+        fileId=file_id,
+        body={
+            'type': 'anyone',
+            'role': 'reader'
+        }
+    )
+
+def share_and_get_link(service, file_id):
+    """
+    Make a file public and get its web view link in one batch request
+    
+    Args:
+        service: Google Drive API client
+        file_id (str): ID of the file
+    
+    Returns:
+        str: URL of the file
+    """
+    responses = {}
+    
+    def callback(request_id, response, exception):
+        if exception is not None:
+            raise exception
+        responses[request_id] = response
+    
+    batch = service.new_batch_http_request(callback=callback)
+    batch.add(public_permission(service, file_id), request_id='permission')
+    batch.add(service.files().get(fileId=file_id, fields='webViewLink'), request_id='file')
+    batch.execute()
+    
+    return responses['file'].get('webViewLink')
+
+def share_files(service, file_ids):
+    """
+    Make files public using batched permission requests
+    
+    Args:
+        service: Google Drive API client
+        file_ids (list): IDs of the files to share
+    """
+    def callback(request_id, response, exception):
+        if exception is not None:
+            raise exception
+    
+    for start in range(0, len(file_ids), DRIVE_BATCH_MAX):
+        batch = service.new_batch_http_request(callback=callback)
+        for file_id in file_ids[start:start + DRIVE_BATCH_MAX]:
+            batch.add(public_permission(service, file_id))
+        batch.execute()
+
 class GoogleDriveService:
     def __init__(self):
         credentials_file = current_app.config['GOOGLE_CREDENTIALS_FILE']
@@ -33,13 +101,18 @@ class GoogleDriveService:
         if folder_id:
             file_metadata['parents'] = [folder_id]
         
-        media = MediaFileUpload(file_path, mimetype=mime_type, resumable=True)
+        media = MediaFileUpload(file_path, mimetype=mime_type, resumable=True,
+                                chunksize=UPLOAD_CHUNK_SIZE)
         
-        file = self.service.files().create(
+        request = self.service.files().create(
             body=file_metadata,
             media_body=media,
             fields='id'
-        ).execute()
+        )
+        
+        file = None
+        while file is None:
+            _, file = request.next_chunk()
         
         return file.get('id')
     
@@ -53,22 +126,8 @@ class GoogleDriveService:
         Returns:
             str: URL of the file
         """
-        # Make the file publicly accessible
-        self.service.permissions().create(
-            fileId=file_id,
-            body={
-                'type': 'anyone',
-                'role': 'reader'
-            }
-        ).execute()
-        
-        # Get the file's web view link
-        file = self.service.files().get(
-            fileId=file_id,
-            fields='webViewLink'
-        ).execute()
-        
-        return file.get('webViewLink')
+        # Share the file and fetch its web view link in one batch round-trip
+        return share_and_get_link(self.service, file_id)
     
     def delete_file(self, file_id):
         """
@@ -1,7 +1,7 @@
 from flask import current_app
-from keycloak import KeycloakOpenID, KeycloakAdmin
 from app import db
 from app.models import User
+from app.services.keycloak_clients import get_keycloak_clients
 
 class KeycloakService:
     def __init__(self):
@@ -10,22 +10,8 @@ class KeycloakService:
         self.client_id = current_app.config['KEYCLOAK_CLIENT_ID']
         self.client_secret = current_app.config['KEYCLOAK_CLIENT_SECRET']
         
-        # Initialize Keycloak OpenID client
-        self.keycloak_openid = KeycloakOpenID(
-            server_url=self.server_url,
-            client_id=self.client_id,
-            realm_name=self.realm,
-            client_secret_key=self.client_secret
-        )
-        
-        # Initialize Keycloak Admin client
-        self.keycloak_admin = KeycloakAdmin(
-            server_url=self.server_url,
-            realm_name=self.realm,
-            client_id=self.client_id,
-            client_secret_key=self.client_secret,
-            verify=True
-        )
+        # Reuse the application's Keycloak clients and their connection pools
+        self.keycloak_openid, self.keycloak_admin = get_keycloak_clients()
     
     def login(self, username, password):
         """
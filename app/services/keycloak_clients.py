@@ -0,0 +1,45 @@
+"""
+Shared Keycloak clients.
+"""
+import threading
+from flask import current_app
+from keycloak import KeycloakOpenID, KeycloakAdmin
+
+_clients_lock = threading.Lock()
+
+
+def get_keycloak_clients():
+    """
+    Get the Keycloak clients shared by all requests of the application.
+
+    The clients are created on first use and stored in app.extensions, so
+    their HTTP sessions and connection pools are reused across requests.
+
+    Returns:
+        tuple: (KeycloakOpenID, KeycloakAdmin)
+    """
+    clients = current_app.extensions.get('keycloak')
+    if clients is not None:
+        return clients
+
+    with _clients_lock:
+        clients = current_app.extensions.get('keycloak')
+        if clients is None:
+            config = current_app.config
+            keycloak_openid = KeycloakOpenID(
+                server_url=config['KEYCLOAK_SERVER_URL'],
+                client_id=config['KEYCLOAK_CLIENT_ID'],
+                realm_name=config['KEYCLOAK_REALM'],
+                client_secret_key=config['KEYCLOAK_CLIENT_SECRET']
+            )
+            keycloak_admin = KeycloakAdmin(
+                server_url=config['KEYCLOAK_SERVER_URL'],
+                realm_name=config['KEYCLOAK_REALM'],
+                client_id=config['KEYCLOAK_CLIENT_ID'],
+                client_secret_key=config['KEYCLOAK_CLIENT_SECRET'],
+                verify=True
+            )
+            clients = (keycloak_openid, keycloak_admin)
+            current_app.extensions['keycloak'] = clients
+
+    return clients
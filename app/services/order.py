@@ -1,10 +1,12 @@
 """
 Order service.
 """
-from sqlalchemy import desc
+from sqlalchemy import Integer, case, column, desc, update, values
+from sqlalchemy.orm import selectinload
 from app import db
 from app.models import Order, OrderItem, Product, User, OrderStatus
 from app.core.exceptions import NotFoundError, BusinessLogicError
+from app.utils.security import current_user_by_kc_id
 
 class OrderService:
     """Service for order operations."""
@@ -25,12 +27,12 @@ class OrderService:
         
         # Filter by user if specified
         if user_id:
-            user = User.query.filter_by(keycloak_id=user_id).first()
+            user = current_user_by_kc_id(user_id)
             if user:
                 query = query.filter_by(user_id=user.id)
         
         # Filter by status if specified
-        if status and status in OrderStatus.all():
+        if status and OrderStatus.valid(status):
             query = query.filter_by(status=status)
         
         # Order by created_at desc
@@ -52,13 +54,13 @@ class OrderService:
         Raises:
             NotFoundError: If order not found or user not authorized
         """
-        order = Order.query.get(order_id)
+        order = Order.query.options(selectinload(Order.items)).get(order_id)
         if not order:
             raise NotFoundError(f"Order with ID {order_id} not found")
         
         # Check if user is authorized to view this order
         if user_id:
-            user = User.query.filter_by(keycloak_id=user_id).first()
+            user = current_user_by_kc_id(user_id)
             if not user or order.user_id != user.id:
                 raise NotFoundError(f"Order with ID {order_id} not found")
         
@@ -80,7 +82,7 @@ class OrderService:
             BusinessLogicError: If business logic validation fails
         """
         # Get user
-        user = User.query.filter_by(keycloak_id=user_keycloak_id).first()
+        user = current_user_by_kc_id(user_keycloak_id)
         if not user:
             raise NotFoundError("User not found")
         
@@ -88,22 +90,35 @@ class OrderService:
         if 'items' not in order_data or not order_data['items']:
             raise BusinessLogicError("Order must contain at least one item")
         
+        # Sum requested quantities per product so repeated products are checked together
+        requested = {}
+        for item_data in order_data['items']:
+            if 'product_id' not in item_data or 'quantity' not in item_data:
+                raise BusinessLogicError("Product ID and quantity are required for each item")
+            product_id = item_data['product_id']
+            requested[product_id] = requested.get(product_id, 0) + item_data['quantity']
+        
+        # Fetch and lock only the columns needed to price the order, in one round-trip
+        products = {
+            product.id: product
+            for product in db.session.query(
+                Product.id, Product.name, Product.price, Product.stock, Product.is_active
+            ).filter(Product.id.in_(requested)).with_for_update()
+        }
+        
         total_amount = 0
         order_items = []
         
         for item_data in order_data['items']:
-            if 'product_id' not in item_data or 'quantity' not in item_data:
-                raise BusinessLogicError("Product ID and quantity are required for each item")
-            
-            product = Product.query.get(item_data['product_id'])
+            product = products.get(item_data['product_id'])
             if not product or not product.is_active:
                 raise BusinessLogicError(f"Product with ID {item_data['product_id']} not found")
             
-            if product.stock < item_data['quantity']:
+            if product.stock < requested[product.id]:
                 raise BusinessLogicError(f"Not enough stock for product {product.name}")
             
             # Calculate item price
-            item_price = float(product.price) * item_data['quantity']
+            item_price = product.price * item_data['quantity']
             total_amount += item_price
             
             # Create order item
@@ -112,9 +127,10 @@ class OrderService:
                 'quantity': item_data['quantity'],
                 'price': product.price
             })
-            
-            # Update product stock
-            product.stock -= item_data['quantity']
+        
+        # Decrement stock for all products in a single UPDATE; the rows are locked and
+        # checked above, so every product is reserved
+        Product.reserve_stock(requested)
         
         # Create order
         order = Order(
@@ -128,15 +144,10 @@ class OrderService:
         db.session.add(order)
         db.session.flush()  # Get the order ID
         
-        # Create order items
+        # Create order items with a single executemany INSERT
         for item_data in order_items:
-            order_item = OrderItem(
-                order_id=order.id,
-                product_id=item_data['product_id'],
-                quantity=item_data['quantity'],
-                price=item_data['price']
-            )
-            db.session.add(order_item)
+            item_data['order_id'] = order.id
+        db.session.execute(OrderItem.__table__.insert(), order_items)
         
         db.session.commit()
         
@@ -157,26 +168,29 @@ class OrderService:
             NotFoundError: If order not found
             BusinessLogicError: If status transition not allowed
         """
-        order = self.get_order_by_id(order_id)
-        
-        # Validate status
-        if status not in OrderStatus.all():
-            valid_statuses = ", ".join(OrderStatus.all())
-            raise BusinessLogicError(f"Status must be one of: {valid_statuses}")
+        # Validate status before locking anything
+        if not OrderStatus.valid(status):
+            raise BusinessLogicError(f"Status must be one of: {OrderStatus.CHOICES}")
         
-        # Check if status transition is allowed
-        if order.status == OrderStatus.CANCELLED and status != OrderStatus.CANCELLED:
-            raise BusinessLogicError("Cannot change status of a cancelled order")
+        order = self._load_order_for_update(order_id)
         
-        if order.status == OrderStatus.DELIVERED and status != OrderStatus.DELIVERED:
-            raise BusinessLogicError("Cannot change status of a delivered order")
-        
-        # If cancelling an order, restore product stock
-        if status == OrderStatus.CANCELLED and order.status != OrderStatus.CANCELLED:
-            self._restore_product_stock(order)
-        
-        order.status = status
-        db.session.commit()
+        try:
+            # Check if status transition is allowed
+            if order.status == OrderStatus.CANCELLED and status != OrderStatus.CANCELLED:
+                raise BusinessLogicError("Cannot change status of a cancelled order")
+            
+            if order.status == OrderStatus.DELIVERED and status != OrderStatus.DELIVERED:
+                raise BusinessLogicError("Cannot change status of a delivered order")
+            
+            # If cancelling an order, restore product stock
+            if status == OrderStatus.CANCELLED and order.status != OrderStatus.CANCELLED:
+                self._restore_product_stock(order)
+            
+            order.status = status
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
         
         return order
     
@@ -195,21 +209,49 @@ class OrderService:
             NotFoundError: If order not found or user not authorized
             BusinessLogicError: If order cannot be cancelled
         """
-        order = self.get_order_by_id(order_id, user_id)
+        order = self._load_order_for_update(order_id, user_id)
         
-        # Check if order can be cancelled
-        if order.status == OrderStatus.CANCELLED:
-            raise BusinessLogicError("Order is already cancelled")
+        try:
+            # Check if order can be cancelled
+            if order.status == OrderStatus.CANCELLED:
+                raise BusinessLogicError("Order is already cancelled")
+            
+            if order.status in (OrderStatus.DELIVERED, OrderStatus.SHIPPED):
+                raise BusinessLogicError(f"Cannot cancel order with status '{order.status}'")
+            
+            # Restore product stock and update order status in one transaction
+            self._restore_product_stock(order)
+            order.status = OrderStatus.CANCELLED
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
         
-        if order.status in [OrderStatus.DELIVERED, OrderStatus.SHIPPED]:
-            raise BusinessLogicError(f"Cannot cancel order with status '{order.status}'")
+        return order
+    
+    def _load_order_for_update(self, order_id, user_id=None):
+        """
+        Load and lock an order together with its items.
         
-        # Restore product stock
-        self._restore_product_stock(order)
+        Args:
+            order_id (int): Order ID
+            user_id (str): Keycloak user ID for authorization check
+            
+        Returns:
+            Order: Locked order object
+            
+        Raises:
+            NotFoundError: If order not found or user not authorized
+        """
+        order = Order.query.options(selectinload(Order.items)).with_for_update().filter_by(id=order_id).first()
+        if not order:
+            raise NotFoundError(f"Order with ID {order_id} not found")
         
-        # Update order status
-        order.status = OrderStatus.CANCELLED
-        db.session.commit()
+        if user_id:
+            user = current_user_by_kc_id(user_id)
+            if not user or order.user_id != user.id:
+                db.session.rollback()
+                raise NotFoundError(f"Order with ID {order_id} not found")
         
         return order
     
@@ -220,7 +262,29 @@ class OrderService:
         Args:
             order (Order): Order object
         """
+        restored = {}
         for item in order.items:
-            product = Product.query.get(item.product_id)
-            if product:
-                product.stock += item.quantity
\ No newline at end of file
+            restored[item.product_id] = restored.get(item.product_id, 0) + item.quantity
+        
+        if not restored:
+            return
+        
+        if db.session.get_bind().dialect.name == 'postgresql':
+            # UPDATE ... FROM (VALUES ...) joins the quantities instead of walking a CASE per row
+            restored_rows = values(
+                column('product_id', Integer), column('quantity', Integer), name='restored'
+            ).data(list(restored.items()))
+            stmt = (
+                update(Product)
+                .where(Product.id == restored_rows.c.product_id)
+                .values(stock=Product.stock + restored_rows.c.quantity)
+            )
+        else:
+            quantity = case(restored, value=Product.id)
+            stmt = (
+                update(Product)
+                .where(Product.id.in_(restored))
+                .values(stock=Product.stock + quantity)
+            )
+        
+        db.session.execute(stmt.execution_options(synchronize_session=False))
\ No newline at end of file
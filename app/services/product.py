@@ -1,12 +1,23 @@
 """
 Product service.
 """
-from sqlalchemy import or_, and_
+from sqlalchemy import or_
 from app import db
 from app.models import Product
 from app.core.exceptions import NotFoundError, ValidationError
 from app.services.storage import StorageService
 
+# Sort expressions for each supported (field, order) pair, built once at import
+_SORT = {
+    ('name', 'asc'): Product.name.asc(),
+    ('name', 'desc'): Product.name.desc(),
+    ('price', 'asc'): Product.price.asc(),
+    ('price', 'desc'): Product.price.desc(),
+    ('created_at', 'asc'): Product.created_at.asc(),
+    ('created_at', 'desc'): Product.created_at.desc(),
+}
+_DEFAULT_SORT = _SORT[('created_at', 'desc')]
+
 class ProductService:
     """Service for product operations."""
     
@@ -39,26 +50,14 @@ class ProductService:
                 )
             )
         
-        # Apply price filters
-        if min_price is not None and max_price is not None:
-            query = query.filter(and_(Product.price >= min_price, Product.price <= max_price))
-        elif min_price is not None:
+        # Apply price filters independently so each bound always compiles to the same clause
+        if min_price is not None:
             query = query.filter(Product.price >= min_price)
-        elif max_price is not None:
+        if max_price is not None:
             query = query.filter(Product.price <= max_price)
         
-        # Apply sorting
-        if sort_by not in ['name', 'price', 'created_at']:
-            sort_by = 'created_at'
-        
-        if sort_order not in ['asc', 'desc']:
-            sort_order = 'desc'
-        
-        sort_column = getattr(Product, sort_by)
-        if sort_order == 'desc':
-            sort_column = sort_column.desc()
-        
-        query = query.order_by(sort_column)
+        # Apply sorting; unknown fields or orders fall back to newest first
+        query = query.order_by(_SORT.get((sort_by, sort_order), _DEFAULT_SORT))
         
         return query
     
@@ -1,13 +1,69 @@
 """
 Storage service for file operations.
 """
+import mimetypes
 import os
+import threading
+import time
 import uuid
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+import httplib2
+import orjson
 from flask import current_app
+from google_auth_httplib2 import AuthorizedHttp
 from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload
+from googleapiclient.errors import HttpError
+from googleapiclient.http import MediaFileUpload, MediaIoBaseUpload
 from google.oauth2 import service_account
+from app.core.cache import TTLCache
+from app.services.google_drive import UPLOAD_CHUNK_SIZE, public_permission, share_and_get_link, share_files
+from app.utils.helpers import generate_unique_filename
+
+# Load the system MIME type tables once instead of on the first upload
+mimetypes.init()
+
+# MIME types of the most common uploads by lower-case extension
+_FAST_MIME = {
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.png': 'image/png',
+    '.gif': 'image/gif',
+    '.webp': 'image/webp',
+    '.svg': 'image/svg+xml',
+    '.bmp': 'image/bmp',
+    '.ico': 'image/x-icon',
+    '.avif': 'image/avif',
+    '.heic': 'image/heic',
+    '.pdf': 'application/pdf',
+    '.txt': 'text/plain',
+    '.csv': 'text/csv',
+    '.json': 'application/json',
+    '.zip': 'application/zip',
+    '.mp4': 'video/mp4',
+    '.webm': 'video/webm',
+    '.mp3': 'audio/mpeg',
+    '.doc': 'application/msword',
+    '.docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+    '.xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+}
+
+# Drive folder IDs by folder name, shared by all StorageService instances
+_FOLDER_CACHE_TTL = 3600
+_folder_cache = TTLCache(maxsize=10000, ttl=_FOLDER_CACHE_TTL)
+_folder_lock = threading.Lock()
+
+# Drive search query for a folder by name; the name must be escaped first
+_FOLDER_QUERY_TEMPLATE = "mimeType='application/vnd.google-apps.folder' and name='{}' and trashed=false"
+
+# Listing of folders used to warm the folder cache in one call
+_FOLDER_LIST_QUERY = "mimeType='application/vnd.google-apps.folder' and trashed=false"
+_FOLDER_LIST_PAGE_SIZE = 1000
+_folder_listing = {'expires': 0.0}
+
+_MULTIPART_UPLOAD_URL = (
+    'https://www.googleapis.com/upload/drive/v3/files'
+    '?uploadType=multipart&fields=id%2CwebViewLink'
+)
 
 class StorageService:
     """Service for file storage operations."""
@@ -21,10 +77,42 @@ class StorageService:
         credentials_file = current_app.config['GOOGLE_CREDENTIALS_FILE']
         scopes = ['https://www.googleapis.com/auth/drive']
         
-        credentials = service_account.Credentials.from_service_account_file(
+        self._credentials = service_account.Credentials.from_service_account_file(
             credentials_file, scopes=scopes)
+        self._local = threading.local()
+    
+    def _ensure_thread_client(self):
+        """
+        Create the current thread's authorized HTTP object and Drive client.
         
-        self.drive_service = build('drive', 'v3', credentials=credentials)
+        The client's HTTP object is not thread-safe, so each thread gets its
+        own client with its own authorized connection.
+        """
+        if getattr(self._local, 'drive_service', None) is None:
+            self._local.http = AuthorizedHttp(self._credentials, http=httplib2.Http())
+            self._local.drive_service = build('drive', 'v3', http=self._local.http, cache_discovery=False)
+    
+    @property
+    def drive_service(self):
+        """
+        Google Drive client for the current thread.
+        
+        Returns:
+            Resource: Google Drive API client
+        """
+        self._ensure_thread_client()
+        return self._local.drive_service
+    
+    @property
+    def _http(self):
+        """
+        Authorized HTTP object backing the current thread's Drive client.
+        
+        Returns:
+            AuthorizedHttp: Authorized HTTP object
+        """
+        self._ensure_thread_client()
+        return self._local.http
     
     def upload_file(self, file, folder=None):
         """
@@ -37,31 +125,70 @@ class StorageService:
         Returns:
             str: URL of the uploaded file
         """
+        folder_id = self._get_or_create_folder(folder) if folder else None
+        uploaded = self._upload(file, folder_id)
+        
+        # Get public URL
+        return self._get_file_url(uploaded['id'], uploaded.get('webViewLink'))
+    
+    def upload_files(self, files, folder=None, max_workers=8):
+        """
+        Upload several files to storage concurrently.
+        
+        Args:
+            files: Iterable of file objects or paths
+            folder (str, optional): Folder to upload to
+            max_workers (int, optional): Maximum number of concurrent uploads
+            
+        Returns:
+            list: URLs of the uploaded files, in the same order as files
+        """
+        files = list(files)
+        if not files:
+            return []
+        
+        # Resolve the folder once instead of once per file
+        folder_id = self._get_or_create_folder(folder) if folder else None
+        app = current_app._get_current_object()
+        
+        def upload(file):
+            with app.app_context():
+                return self._upload(file, folder_id)
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(files))) as executor:
+            uploaded = list(executor.map(upload, files))
+        
+        # Share all uploaded files in as few batch requests as possible
+        share_files(self.drive_service, [file['id'] for file in uploaded])
+        
+        return [file.get('webViewLink') for file in uploaded]
+    
+    def _upload(self, file, folder_id=None):
+        """
+        Upload a single file to a resolved Drive folder.
+        
+        Args:
+            file: File object or path
+            folder_id (str, optional): ID of the folder to upload to
+            
+        Returns:
+            dict: Uploaded file with 'id' and 'webViewLink'
+        """
         # Handle different file input types
         if isinstance(file, str):
             # File path
-            file_path = file
-            file_name = os.path.basename(file_path)
+            source = file
+            file_name = os.path.basename(file)
         else:
-            # File object (e.g., from request.files)
+            # File object (e.g., from request.files), streamed straight to Drive
+            source = file.stream
             file_name = self._generate_unique_filename(file.filename)
-            file_path = os.path.join('/tmp', file_name)
-            file.save(file_path)
         
         # Get MIME type
         mime_type, _ = self._get_mime_type(file_name)
         
         # Upload to Google Drive
-        file_id = self._upload_to_drive(file_path, file_name, mime_type, folder)
-        
-        # Get public URL
-        url = self._get_file_url(file_id)
-        
-        # Clean up temporary file if needed
-        if not isinstance(file, str):
-            os.remove(file_path)
-        
-        return url
+        return self._upload_to_drive(source, file_name, mime_type, folder_id)
     
     def delete_file(self, file_url):
         """
@@ -83,69 +210,180 @@ class StorageService:
         
         return True
     
-    def _upload_to_drive(self, file_path, file_name, mime_type, folder=None):
+    def _upload_to_drive(self, source, file_name, mime_type, folder_id=None):
         """
         Upload a file to Google Drive.
         
         Args:
-            file_path (str): Path to the file
+            source (str|IOBase): Path to the file or a seekable binary stream
             file_name (str): Name of the file
             mime_type (str): MIME type of the file
-            folder (str, optional): Folder to upload to
+            folder_id (str, optional): ID of the folder to upload to
             
         Returns:
-            str: ID of the uploaded file
+            dict: Uploaded file with 'id' and 'webViewLink'
         """
         file_metadata = {
             'name': file_name
         }
         
-        if folder:
-            # Get or create folder
-            folder_id = self._get_or_create_folder(folder)
+        if folder_id:
             file_metadata['parents'] = [folder_id]
         
-        media = MediaFileUpload(file_path, mimetype=mime_type, resumable=True)
+        # Small files go up in a single multipart request; only large ones pay for a resumable session
+        threshold = current_app.config.get('DRIVE_RESUMABLE_THRESHOLD', 5 * 1024 * 1024)
+        chunksize = current_app.config.get('DRIVE_CHUNKSIZE', UPLOAD_CHUNK_SIZE)
         
-        file = self.drive_service.files().create(
+        if isinstance(source, str):
+            if os.stat(source).st_size <= threshold:
+                with open(source, 'rb') as f:
+                    return self._upload_small_multipart(f.read(), file_metadata, mime_type)
+            media = MediaFileUpload(source, mimetype=mime_type, resumable=True, chunksize=chunksize)
+        else:
+            source.seek(0, os.SEEK_END)
+            size = source.tell()
+            source.seek(0)
+            if size <= threshold:
+                return self._upload_small_multipart(source.read(), file_metadata, mime_type)
+            media = MediaIoBaseUpload(source, mimetype=mime_type, resumable=True, chunksize=chunksize)
+        
+        request = self.drive_service.files().create(
             body=file_metadata,
             media_body=media,
-            fields='id'
-        ).execute()
+            fields='id, webViewLink'
+        )
+        
+        file = None
+        while file is None:
+            _, file = request.next_chunk()
         
-        return file.get('id')
+        return file
     
-    def _get_file_url(self, file_id):
+    def _upload_small_multipart(self, data, file_metadata, mime_type):
+        """
+        Upload a small file to Google Drive in a single multipart/related POST.
+        
+        The body is assembled directly from bytes, skipping the client
+        library's media upload machinery.
+        
+        Args:
+            data (bytes): File content
+            file_metadata (dict): Drive file metadata
+            mime_type (str): MIME type of the file
+            
+        Returns:
+            dict: Uploaded file with 'id' and 'webViewLink'
+            
+        Raises:
+            HttpError: If Drive rejects the upload
+        """
+        boundary = uuid.uuid4().hex.encode('ascii')
+        body = b''.join((
+            b'--', boundary, b'\r\nContent-Type: application/json; charset=UTF-8\r\n\r\n',
+            orjson.dumps(file_metadata),
+            b'\r\n--', boundary, b'\r\nContent-Type: ', mime_type.encode('ascii'), b'\r\n\r\n',
+            data,
+            b'\r\n--', boundary, b'--',
+        ))
+        
+        response, content = self._http.request(
+            _MULTIPART_UPLOAD_URL,
+            method='POST',
+            body=body,
+            headers={'Content-Type': f'multipart/related; boundary={boundary.decode("ascii")}'}
+        )
+        if response.status >= 400:
+            raise HttpError(response, content, uri=_MULTIPART_UPLOAD_URL)
+        
+        return orjson.loads(content)
+    
+    def _get_file_url(self, file_id, web_view_link=None):
         """
         Get the URL of a file in Google Drive.
         
         Args:
             file_id (str): ID of the file
+            web_view_link (str, optional): Link already returned by the upload
             
         Returns:
             str: URL of the file
         """
-        # Make the file publicly accessible
-        self.drive_service.permissions().create(
-            fileId=file_id,
-            body={
-                'type': 'anyone',
-                'role': 'reader'
-            }
-        ).execute()
+        if web_view_link:
+            # Make the file publicly accessible
+            public_permission(self.drive_service, file_id).execute()
+            return web_view_link
         
-        # Get the file's web view link
-        file = self.drive_service.files().get(
-            fileId=file_id,
-            fields='webViewLink'
-        ).execute()
-        
-        return file.get('webViewLink')
+        # Share the file and fetch its web view link in one batch round-trip
+        return share_and_get_link(self.drive_service, file_id)
     
     def _get_or_create_folder(self, folder_name):
         """
         Get or create a folder in Google Drive.
         
+        Args:
+            folder_name (str): Name of the folder
+            
+        Returns:
+            str: ID of the folder
+        """
+        folder_id = _folder_cache.get(folder_name)
+        if folder_id:
+            return folder_id
+        
+        # One listing warms the cache for every folder; it runs outside the lock
+        if self._claim_folder_listing():
+            self._cache_all_folders()
+            folder_id = _folder_cache.get(folder_name)
+            if folder_id:
+                return folder_id
+        
+        # Resolve misses under the lock so concurrent uploads do not create duplicate folders.
+        # The lock is per process, so always look the name up again right before creating.
+        with _folder_lock:
+            folder_id = _folder_cache.get(folder_name)
+            if folder_id:
+                return folder_id
+            
+            folder_id = self._find_or_create_folder(folder_name)
+            _folder_cache.set(folder_name, folder_id)
+        
+        return folder_id
+    
+    def _claim_folder_listing(self):
+        """
+        Claim the next folder listing if the last one has expired.
+        
+        Returns:
+            bool: True if the caller should run the listing
+        """
+        with _folder_lock:
+            now = time.monotonic()
+            if _folder_listing['expires'] > now:
+                return False
+            _folder_listing['expires'] = now + _FOLDER_CACHE_TTL
+            return True
+    
+    def _cache_all_folders(self):
+        """
+        Cache the IDs of the folders visible to the service account.
+        """
+        results = self.drive_service.files().list(
+            q=_FOLDER_LIST_QUERY,
+            spaces='drive',
+            pageSize=_FOLDER_LIST_PAGE_SIZE,
+            fields='files(id, name)'
+        ).execute()
+        
+        # Keep the first match per name, like the per-name lookup does
+        entries = {}
+        for item in results.get('files', []):
+            entries.setdefault(item['name'], item['id'])
+        _folder_cache.update(entries)
+    
+    def _find_or_create_folder(self, folder_name):
+        """
+        Look up a folder in Google Drive by name, creating it if missing.
+        
         Args:
             folder_name (str): Name of the folder
             
@@ -153,14 +391,26 @@ class StorageService:
             str: ID of the folder
         """
         # Check if folder exists
-        query = f"mimeType='application/vnd.google-apps.folder' and name='{folder_name}' and trashed=false"
+        escaped_name = folder_name.replace('\\', '\\\\').replace("'", "\\'")
+        query = _FOLDER_QUERY_TEMPLATE.format(escaped_name)
         results = self.drive_service.files().list(q=query, spaces='drive', fields='files(id, name)').execute()
         
         items = results.get('files', [])
         if items:
             return items[0]['id']
         
-        # Create folder
+        return self._create_folder(folder_name)
+    
+    def _create_folder(self, folder_name):
+        """
+        Create a folder in Google Drive.
+        
+        Args:
+            folder_name (str): Name of the folder
+            
+        Returns:
+            str: ID of the folder
+        """
         file_metadata = {
             'name': folder_name,
             'mimeType': 'application/vnd.google-apps.folder'
@@ -209,11 +459,7 @@ class StorageService:
         Returns:
             str: Unique filename
         """
-        filename, extension = os.path.splitext(original_filename)
-        unique_id = str(uuid.uuid4())
-        timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
-        
-        return f"{filename}_{timestamp}_{unique_id}{extension}"
+        return generate_unique_filename(original_filename)
     
     def _get_mime_type(self, filename):
         """
@@ -225,13 +471,12 @@ class StorageService:
         Returns:
             tuple: (mime_type, extension)
         """
-        import mimetypes
+        extension = os.path.splitext(filename)[1]
         
-        mime_type, encoding = mimetypes.guess_type(filename)
+        # Common upload types are resolved without consulting the mimetypes tables
+        mime_type = _FAST_MIME.get(extension.lower())
         if mime_type is None:
             # Default to binary data
-            mime_type = 'application/octet-stream'
-        
-        extension = os.path.splitext(filename)[1]
+            mime_type = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
         
         return mime_type, extension
\ No newline at end of file
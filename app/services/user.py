@@ -1,12 +1,15 @@
 """
 User service.
 """
-from sqlalchemy import or_
+from sqlalchemy import or_, select, update
 from app import db
 from app.models import User
 from app.core.exceptions import NotFoundError
 from app.services.auth import AuthService
 
+# Profile fields that may be changed through update_user_by_keycloak_id
+_UPDATABLE_FIELDS = frozenset(('email', 'first_name', 'last_name'))
+
 class UserService:
     """Service for user operations."""
     
@@ -52,8 +55,8 @@ class UserService:
         Raises:
             NotFoundError: If user not found
         """
-        user = User.query.filter_by(id=user_id, is_active=True).first()
-        if not user:
+        user = db.session.get(User, user_id)
+        if not user or not user.is_active:
             raise NotFoundError(f"User with ID {user_id} not found")
         return user
     
@@ -70,7 +73,9 @@ class UserService:
         Raises:
             NotFoundError: If user not found
         """
-        user = User.query.filter_by(keycloak_id=keycloak_id, is_active=True).first()
+        user = db.session.execute(
+            select(User).where(User.keycloak_id == keycloak_id, User.is_active.is_(True))
+        ).scalar_one_or_none()
         if not user:
             raise NotFoundError(f"User with Keycloak ID {keycloak_id} not found")
         return user
@@ -85,7 +90,9 @@ class UserService:
         Returns:
             User: User object or None if not found
         """
-        return User.query.filter_by(email=email, is_active=True).first()
+        return db.session.execute(
+            select(User).where(User.email == email, User.is_active.is_(True))
+        ).scalar_one_or_none()
     
     def update_user_by_keycloak_id(self, keycloak_id, user_data):
         """
@@ -101,12 +108,19 @@ class UserService:
         Raises:
             NotFoundError: If user not found
         """
-        user = self.get_user_by_keycloak_id(keycloak_id)
-        
-        # Update user attributes
-        for key, value in user_data.items():
-            if hasattr(user, key):
-                setattr(user, key, value)
+        values = {key: value for key, value in user_data.items() if key in _UPDATABLE_FIELDS}
+        if not values:
+            return self.get_user_by_keycloak_id(keycloak_id)
+        
+        # Write the changes and read back the updated row in a single round-trip
+        user = db.session.execute(
+            update(User)
+            .where(User.keycloak_id == keycloak_id, User.is_active.is_(True))
+            .values(**values)
+            .returning(User)
+        ).scalar_one_or_none()
+        if not user:
+            raise NotFoundError(f"User with Keycloak ID {keycloak_id} not found")
         
         db.session.commit()
         
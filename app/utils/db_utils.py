@@ -4,38 +4,49 @@ Database utility functions.
 This module provides utility functions for database operations.
 """
 import time
+import random
 import logging
+from sqlalchemy import text
 from sqlalchemy.exc import SQLAlchemyError, OperationalError, DisconnectionError
 from functools import wraps
 
 logger = logging.getLogger(__name__)
 
+# Connection level errors that are worth retrying
+_RETRYABLE_ERRORS = (OperationalError, DisconnectionError)
+
+# Liveness probe, built once so SQLAlchemy can reuse its compiled form
+_PING = text("SELECT 1")
+
 def with_db_retry(max_retries=3, retry_delay=1):
     """
     Decorator to retry database operations on connection errors.
     
+    Retries back off exponentially from retry_delay with a little random
+    jitter, so workers that failed together do not retry in lockstep.
+    
     Args:
-        max_retries (int): Maximum number of retry attempts
-        retry_delay (int): Delay between retries in seconds
+        max_retries (int): Maximum number of attempts
+        retry_delay (int): Delay before the first retry in seconds
         
     Returns:
         Function decorator
     """
+    attempts = max(1, max_retries)
+    
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
-            retries = 0
-            while retries < max_retries:
+            for attempt in range(1, attempts + 1):
                 try:
                     return func(*args, **kwargs)
-                except (OperationalError, DisconnectionError) as e:
-                    retries += 1
-                    if retries >= max_retries:
-                        logger.error(f"Database operation failed after {max_retries} retries: {str(e)}")
+                except _RETRYABLE_ERRORS as e:
+                    if attempt >= attempts:
+                        logger.error(f"Database operation failed after {attempts} retries: {str(e)}")
                         raise
                     
-                    logger.warning(f"Database connection error, retrying ({retries}/{max_retries}): {str(e)}")
-                    time.sleep(retry_delay * retries)  # Exponential backoff
+                    logger.warning(f"Database connection error, retrying ({attempt}/{attempts}): {str(e)}")
+                    time.sleep(retry_delay * (2 ** (attempt - 1)) + random.uniform(0, 0.1))
                 except SQLAlchemyError as e:
                     logger.error(f"Database error: {str(e)}")
                     raise
@@ -54,7 +65,7 @@ def check_db_connection(db):
     """
     try:
         # Execute a simple query to check connection
-        db.session.execute("SELECT 1")
+        db.session.execute(_PING).scalar()
         return True
     except Exception as e:
         logger.error(f"Database connection check failed: {str(e)}")
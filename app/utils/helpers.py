@@ -1,8 +1,9 @@
 import os
+import time
 import uuid
-from datetime import datetime
 from functools import wraps
-from flask import request, jsonify, current_app
+from flask import request, current_app
+from app.core.json_provider import json_response
 
 def generate_unique_filename(original_filename):
     """
@@ -15,10 +16,8 @@ def generate_unique_filename(original_filename):
         str: Unique filename
     """
     filename, extension = os.path.splitext(original_filename)
-    unique_id = str(uuid.uuid4())
-    timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
     
-    return f"{filename}_{timestamp}_{unique_id}{extension}"
+    return f"{filename}_{time.time_ns()}_{uuid.uuid4().hex}{extension}"
 
 def get_pagination_params():
     """
@@ -27,12 +26,12 @@ def get_pagination_params():
     Returns:
         tuple: (page, per_page)
     """
-    page = request.args.get('page', 1, type=int)
+    page = max(1, request.args.get('page', 1, type=int))
     per_page = request.args.get('per_page', 10, type=int)
     
-    # Limit per_page to a reasonable value
-    max_per_page = current_app.config.get('MAX_PER_PAGE', 100)
-    per_page = min(per_page, max_per_page)
+    # Clamp per_page between 1 and the limit resolved at app creation
+    max_per_page = current_app.extensions.get('pagination_max', 100)
+    per_page = max(1, min(per_page, max_per_page))
     
     return page, per_page
 
@@ -47,7 +46,7 @@ def format_response(data, status_code=200):
     Returns:
         tuple: (response, status_code)
     """
-    return jsonify(data), status_code
+    return json_response(data, status_code), status_code
 
 def handle_error(error_message, status_code=400):
     """
@@ -60,4 +59,4 @@ def handle_error(error_message, status_code=400):
     Returns:
         tuple: (response, status_code)
     """
-    return jsonify({'error': error_message}), status_code
\ No newline at end of file
+    return json_response({'error': error_message}, status_code), status_code
\ No newline at end of file
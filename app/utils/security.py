@@ -1,7 +1,15 @@
+import hashlib
+import hmac
+import os
 from functools import wraps
-from flask import request, jsonify, current_app
-import jwt
-from app.services.keycloak import KeycloakService
+from flask import request, jsonify, abort, g
+from app import db
+from app.models import User
+from app.services.auth import AuthService
+
+# PBKDF2 parameters; changing them invalidates existing password hashes
+_SALT_SIZE = 32
+_PBKDF2_ITERATIONS = 100000
 
 def get_token_from_header():
     """
@@ -20,18 +28,16 @@ def validate_token(token):
     """
     Validate a JWT token with Keycloak
     
+    Tokens are verified locally against the realm keys and the result is
+    cached until the token expires, so most requests skip Keycloak entirely.
+    
     Args:
         token (str): JWT token
     
     Returns:
         dict: Token info or None if invalid
     """
-    try:
-        keycloak_service = KeycloakService()
-        return keycloak_service.keycloak_openid.introspect(token)
-    except Exception as e:
-        current_app.logger.error(f"Token validation error: {str(e)}")
-        return None
+    return AuthService().validate_token(token)
 
 def token_required(roles=None):
     """
@@ -69,6 +75,49 @@ def token_required(roles=None):
     
     return decorator
 
+def get_current_user_id(token_info):
+    """
+    Resolve the local user ID for an authenticated token
+    
+    Selects only the ID column, reusing a row current_user_by_kc_id already
+    loaded, and memoizes the result on flask.g for the current request.
+    
+    Args:
+        token_info (dict): Token info passed to the route as current_user
+    
+    Returns:
+        int: Local user ID
+    """
+    keycloak_id = token_info['sub']
+    ids = g.setdefault('_user_id_cache', {})
+    if keycloak_id not in ids:
+        user = g.get('_user_cache', {}).get(keycloak_id)
+        if user is not None:
+            ids[keycloak_id] = user.id
+        else:
+            ids[keycloak_id] = db.session.query(User.id).filter_by(keycloak_id=keycloak_id).scalar()
+    if ids[keycloak_id] is None:
+        abort(404)
+    return ids[keycloak_id]
+
+def current_user_by_kc_id(keycloak_id):
+    """
+    Get a user by Keycloak ID, memoized for the current request
+    
+    The cache lives on flask.g, so it is discarded with the request and
+    needs no invalidation.
+    
+    Args:
+        keycloak_id (str): Keycloak user ID
+    
+    Returns:
+        User: User object or None if not found
+    """
+    cache = g.setdefault('_user_cache', {})
+    if keycloak_id not in cache:
+        cache[keycloak_id] = User.query.filter_by(keycloak_id=keycloak_id).first()
+    return cache[keycloak_id]
+
 def hash_password(password):
     """
     Hash a password (not used with Keycloak, but kept for reference)
@@ -79,18 +128,15 @@ def hash_password(password):
     Returns:
         str: Hashed password
     """
-    import hashlib
-    import os
-    
     # Generate a random salt
-    salt = os.urandom(32)
+    salt = os.urandom(_SALT_SIZE)
     
     # Hash the password with the salt
     key = hashlib.pbkdf2_hmac(
         'sha256',
         password.encode('utf-8'),
         salt,
-        100000
+        _PBKDF2_ITERATIONS
     )
     
     # Return the salt and key
@@ -107,21 +153,19 @@ def verify_password(stored_password, provided_password):
     Returns:
         bool: True if password matches
     """
-    import hashlib
-    
     # Extract the salt from the stored password
-    salt = stored_password[:32]
+    salt = stored_password[:_SALT_SIZE]
     
     # Extract the key from the stored password
-    stored_key = stored_password[32:]
+    stored_key = stored_password[_SALT_SIZE:]
     
     # Hash the provided password with the salt
     key = hashlib.pbkdf2_hmac(
         'sha256',
         provided_password.encode('utf-8'),
         salt,
-        100000
+        _PBKDF2_ITERATIONS
     )
     
-    # Compare the keys
-    return key == stored_key
\ No newline at end of file
+    # Compare the keys in constant time
+    return hmac.compare_digest(key, stored_key)
\ No newline at end of file
@@ -0,0 +1,28 @@
+"""
+Gunicorn configuration.
+
+Usage: gunicorn -c gunicorn.conf.py run:app
+"""
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+
+# Threaded workers overlap the I/O-bound Keycloak, database and Drive calls
+worker_class = 'gthread'
+# Fixed default: each worker has its own database pool (up to pool_size + max_overflow
+# connections), and cpu_count() reports host cores inside containers
+workers = int(os.environ.get('WEB_CONCURRENCY', 4))
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+
+# Load the application once in the master so workers share its memory copy-on-write
+preload_app = True
+
+
+def post_fork(server, worker):
+    """Drop database connections inherited from the master process."""
+    from app import db
+    from run import app
+
+    with app.app_context():
+        db.engine.dispose(close=False)
@@ -0,0 +1,23 @@
+-- Listing and search indexes for databases created before they were declared on the models.
+-- db.create_all() skips existing tables, so these are never created there otherwise.
+--
+-- PostgreSQL only. CREATE INDEX CONCURRENTLY cannot run inside a transaction, so run the
+-- script in autocommit mode, e.g.: psql "$DATABASE_URL" -f migrations/sql/001_listing_indexes.sql
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Partial indexes matching the active product listing sorts
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_products_active_created_at
+    ON products (created_at DESC) WHERE is_active;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_products_active_price
+    ON products (price) WHERE is_active;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_products_active_name
+    ON products (name) WHERE is_active;
+
+-- Trigram index so ILIKE '%term%' searches on name and description can use an index
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_products_search_trgm
+    ON products USING gin (name gin_trgm_ops, description gin_trgm_ops);
+
+-- Partial index matching the active user listing, newest first
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_users_active_created_at
+    ON users (created_at DESC) WHERE is_active;
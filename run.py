@@ -1,6 +1,9 @@
 #!/usr/bin/env python3
 """
 Application entry point.
+
+Running this module starts the Flask development server. In production the
+app is served by gunicorn: gunicorn -c gunicorn.conf.py run:app
 """
 import os
 from app import create_app
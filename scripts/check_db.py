@@ -8,6 +8,7 @@ import os
 import sys
 import logging
 import psycopg2
+from urllib.parse import unquote, urlparse
 
 # Add the parent directory to the path so we can import the app
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -30,34 +31,18 @@ def check_db_connection():
         logger.error("No database URL found in environment variables")
         return False
     
-    # Parse database URL
-    if db_url.startswith('postgresql://'):
-        # Extract connection parameters from URL
-        db_url = db_url.replace('postgresql://', '')
-        user_pass, host_db = db_url.split('@')
-        
-        if ':' in user_pass:
-            user, password = user_pass.split(':')
-        else:
-            user = user_pass
-            password = ''
-        
-        if '/' in host_db:
-            host_port, db = host_db.split('/')
-        else:
-            host_port = host_db
-            db = ''
-        
-        if ':' in host_port:
-            host, port = host_port.split(':')
-            port = int(port)
-        else:
-            host = host_port
-            port = 5432
-    else:
-        logger.error(f"Unsupported database URL format: {db_url}")
+    # Parse database URL; credentials may be percent-encoded
+    url = urlparse(db_url)
+    if url.scheme not in ('postgresql', 'postgres'):
+        logger.error(f"Unsupported database URL scheme: {url.scheme}")
         return False
     
+    host = url.hostname
+    port = url.port or 5432
+    user = unquote(url.username or '')
+    password = unquote(url.password or '')
+    db = url.path.lstrip('/')
+    
     # Try to connect to the database
     try:
         logger.info(f"Connecting to database {db} on {host}:{port} as {user}")
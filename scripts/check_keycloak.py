@@ -8,6 +8,7 @@ import os
 import sys
 import logging
 import requests
+from requests.adapters import HTTPAdapter
 
 # Add the parent directory to the path so we can import the app
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -19,6 +20,11 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Shared session so repeated checks and the fallback probe reuse the keep-alive connection
+_session = requests.Session()
+_session.mount('http://', HTTPAdapter(pool_connections=2, pool_maxsize=4))
+_session.mount('https://', HTTPAdapter(pool_connections=2, pool_maxsize=4))
+
 def check_keycloak_connection():
     """Check if the Keycloak connection is working properly."""
     # Get Keycloak connection parameters from environment variables
@@ -32,7 +38,7 @@ def check_keycloak_connection():
     # Check if Keycloak is running
     try:
         logger.info(f"Checking Keycloak connection at {keycloak_url}")
-        response = requests.get(f"{keycloak_url}/health", timeout=5)
+        response = _session.get(f"{keycloak_url}/health", timeout=5)
         
         if response.status_code == 200:
             logger.info("Keycloak health check passed")
@@ -46,7 +52,7 @@ def check_keycloak_connection():
         # Try alternative endpoint
         try:
             logger.info("Trying alternative Keycloak endpoint")
-            response = requests.get(f"{keycloak_url}/realms/{keycloak_realm}/.well-known/openid-configuration", timeout=5)
+            response = _session.get(f"{keycloak_url}/realms/{keycloak_realm}/.well-known/openid-configuration", timeout=5)
             
             if response.status_code == 200:
                 logger.info("Keycloak realm configuration check passed")
@@ -31,7 +31,7 @@ flask db upgrade
 echo "Starting the application..."
 if [ "$FLASK_CONFIG" = "production" ]; then
     echo "Running in production mode with gunicorn..."
-    gunicorn --bind 0.0.0.0:5000 --workers 4 --timeout 120 run:app
+    gunicorn -c gunicorn.conf.py run:app
 else
     echo "Running in development mode with Flask development server..."
     flask run --host=0.0.0.0
@@ -7,252 +7,247 @@ This script sets up the Keycloak realm and client for the application.
 import os
 import sys
 import logging
-import requests
 import json
 import base64
+import re
+from concurrent.futures import ThreadPoolExecutor
 
 # Add the parent directory to the path so we can import the app
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
+# Realm and client representations; the realm name and clientId come from the environment
+REALM_SETTINGS = {
+    'enabled': True,
+    'displayName': 'BuyZaar',
+    'displayNameHtml': '<div class="kc-logo-text"><span>BuyZaar</span></div>',
+    'loginTheme': 'keycloak',
+    'accountTheme': 'keycloak',
+    'adminTheme': 'keycloak',
+    'emailTheme': 'keycloak',
+    'accessTokenLifespan': 900,  # 15 minutes
+    'ssoSessionIdleTimeout': 1800,  # 30 minutes
+    'ssoSessionMaxLifespan': 36000,  # 10 hours
+    'offlineSessionIdleTimeout': 2592000,  # 30 days
+    'accessCodeLifespan': 60,  # 1 minute
+    'accessCodeLifespanUserAction': 300,  # 5 minutes
+    'accessCodeLifespanLogin': 1800,  # 30 minutes
+    'bruteForceProtected': True,
+    'permanentLockout': False,
+    'maxFailureWaitSeconds': 900,  # 15 minutes
+    'minimumQuickLoginWaitSeconds': 60,  # 1 minute
+    'waitIncrementSeconds': 60,  # 1 minute
+    'quickLoginCheckMilliSeconds': 1000,  # 1 second
+    'maxDeltaTimeSeconds': 43200,  # 12 hours
+    'failureFactor': 3  # 3 failures
+}
+
+CLIENT_SETTINGS = {
+    'enabled': True,
+    'name': 'BuyZaar Client',
+    'description': 'BuyZaar Client',
+    'rootUrl': 'http://localhost:5173',
+    'adminUrl': 'http://localhost:5173',
+    'baseUrl': 'http://localhost:5173',
+    'redirectUris': [
+        'http://localhost:5173/*',
+        'http://localhost:5000/*'
+    ],
+    'webOrigins': [
+        'http://localhost:5173',
+        'http://localhost:5000'
+    ],
+    'publicClient': False,
+    'directAccessGrantsEnabled': True,
+    'standardFlowEnabled': True,
+    'implicitFlowEnabled': False,
+    'serviceAccountsEnabled': True,
+    'authorizationServicesEnabled': True,
+    'fullScopeAllowed': True
+}
+
+_CLIENT_SECRET_LINE = re.compile(r'^KEYCLOAK_CLIENT_SECRET=.*$', re.M)
+
+class KeycloakSetupError(Exception):
+    """Raised when a Keycloak admin call returns an unexpected status."""
+    
+    def __init__(self, step, detail):
+        super().__init__(f"Failed to {step}: {detail}")
+
+def _get_admin_token(session, keycloak_url, username, password):
+    """Get an admin token with the password grant; it is only kept in memory for this run."""
+    logger.info(f"Getting admin token from Keycloak at {keycloak_url}")
+    response = session.post(
+        f"{keycloak_url}/realms/master/protocol/openid-connect/token",
+        data={
+            'grant_type': 'password',
+            'client_id': 'admin-cli',
+            'username': username,
+            'password': password
+        },
+        timeout=10
+    )
+    
+    if response.status_code != 200:
+        raise KeycloakSetupError("get admin token", response.text)
+    
+    logger.info("Got admin token")
+    return response.json()['access_token']
+
+def _build_session():
+    """Build a session that keeps one keep-alive connection to Keycloak for all admin calls."""
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util import Retry
+    
+    # requests only speaks HTTP/1.1; the setup makes a handful of calls, mostly on one
+    # keep-alive connection, so HTTP/2 multiplexing would save little over this pool
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=4,
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+def _load_settings():
+    """Read the Keycloak connection parameters from environment variables."""
+    return {
+        # Remove trailing slash if present
+        'url': os.environ.get('KEYCLOAK_SERVER_URL', 'http://3.6.134.85:8080/').rstrip('/'),
+        'realm': os.environ.get('KEYCLOAK_REALM', 'buyzaar'),
+        'client_id': os.environ.get('KEYCLOAK_CLIENT_ID', 'buyzaar-client'),
+        'admin': os.environ.get('KEYCLOAK_ADMIN', 'admin'),
+        'admin_password': os.environ.get('KEYCLOAK_ADMIN_PASSWORD', 'admin')
+    }
+
 def setup_keycloak():
     """Set up the Keycloak realm and client for the application."""
-    # Get Keycloak connection parameters from environment variables
-    keycloak_url = os.environ.get('KEYCLOAK_SERVER_URL', 'http://3.6.134.85:8080/')
-    keycloak_realm = os.environ.get('KEYCLOAK_REALM', 'buyzaar')
-    keycloak_client_id = os.environ.get('KEYCLOAK_CLIENT_ID', 'buyzaar-client')
-    keycloak_admin = os.environ.get('KEYCLOAK_ADMIN', 'admin')
-    keycloak_admin_password = os.environ.get('KEYCLOAK_ADMIN_PASSWORD', 'admin')
+    with _build_session() as session:
+        return _setup_keycloak(session, _load_settings())
+
+def _setup_keycloak(session, settings):
+    """Set up the Keycloak realm and client using the given session."""
+    import requests
     
-    # Remove trailing slash if present
-    if keycloak_url.endswith('/'):
-        keycloak_url = keycloak_url[:-1]
+    keycloak_url = settings['url']
+    keycloak_realm = settings['realm']
+    keycloak_client_id = settings['client_id']
     
-    # Get admin token
-    try:
-        logger.info(f"Getting admin token from Keycloak at {keycloak_url}")
-        response = requests.post(
-            f"{keycloak_url}/realms/master/protocol/openid-connect/token",
-            data={
-                'grant_type': 'password',
-                'client_id': 'admin-cli',
-                'username': keycloak_admin,
-                'password': keycloak_admin_password
-            },
-            headers={
-                'Content-Type': 'application/x-www-form-urlencoded'
-            },
-            timeout=10
-        )
-        
-        if response.status_code != 200:
-            logger.error(f"Failed to get admin token: {response.text}")
-            return False
-        
-        admin_token = response.json()['access_token']
-        logger.info("Got admin token")
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Failed to get admin token: {str(e)}")
-        return False
+    def _req(method, path, *, expect=200, step, **kwargs):
+        """Send an admin request and raise KeycloakSetupError on an unexpected status."""
+        response = session.request(method, f"{keycloak_url}{path}", timeout=10, **kwargs)
+        expected = expect if isinstance(expect, tuple) else (expect,)
+        if response.status_code not in expected:
+            raise KeycloakSetupError(step, response.text)
+        return response
+    
+    clients_path = f"/admin/realms/{keycloak_realm}/clients"
     
-    # Check if realm exists
     try:
-        logger.info(f"Checking if realm {keycloak_realm} exists")
-        response = requests.get(
-            f"{keycloak_url}/admin/realms/{keycloak_realm}",
-            headers={
-                'Authorization': f'Bearer {admin_token}'
-            },
-            timeout=10
-        )
+        # Get admin token
+        admin_token = _get_admin_token(session, keycloak_url, settings['admin'], settings['admin_password'])
+        session.headers.update({'Authorization': f'Bearer {admin_token}'})
         
-        realm_exists = response.status_code == 200
+        # The realm and client probes are independent, so they run concurrently on the pooled
+        # session; the adapter's pool_maxsize must stay at least 2 for them to use separate sockets
+        logger.info(f"Checking if realm {keycloak_realm} and client {keycloak_client_id} exist")
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            realm_future = executor.submit(
+                _req, 'GET', f"/admin/realms/{keycloak_realm}",
+                expect=(200, 404), step="check realm"
+            )
+            clients_future = executor.submit(
+                _req, 'GET', clients_path,
+                expect=(200, 404), step="check client",
+                params={'clientId': keycloak_client_id}
+            )
+            realm_exists = realm_future.result().status_code == 200
+            clients_response = clients_future.result()
         
         if realm_exists:
             logger.info(f"Realm {keycloak_realm} already exists")
         else:
             logger.info(f"Realm {keycloak_realm} does not exist, creating it")
-            
-            # Create realm
-            response = requests.post(
-                f"{keycloak_url}/admin/realms",
-                json={
-                    'realm': keycloak_realm,
-                    'enabled': True,
-                    'displayName': 'BuyZaar',
-                    'displayNameHtml': '<div class="kc-logo-text"><span>BuyZaar</span></div>',
-                    'loginTheme': 'keycloak',
-                    'accountTheme': 'keycloak',
-                    'adminTheme': 'keycloak',
-                    'emailTheme': 'keycloak',
-                    'accessTokenLifespan': 900,  # 15 minutes
-                    'ssoSessionIdleTimeout': 1800,  # 30 minutes
-                    'ssoSessionMaxLifespan': 36000,  # 10 hours
-                    'offlineSessionIdleTimeout': 2592000,  # 30 days
-                    'accessCodeLifespan': 60,  # 1 minute
-                    'accessCodeLifespanUserAction': 300,  # 5 minutes
-                    'accessCodeLifespanLogin': 1800,  # 30 minutes
-                    'bruteForceProtected': True,
-                    'permanentLockout': False,
-                    'maxFailureWaitSeconds': 900,  # 15 minutes
-                    'minimumQuickLoginWaitSeconds': 60,  # 1 minute
-                    'waitIncrementSeconds': 60,  # 1 minute
-                    'quickLoginCheckMilliSeconds': 1000,  # 1 second
-                    'maxDeltaTimeSeconds': 43200,  # 12 hours
-                    'failureFactor': 3  # 3 failures
-                },
-                headers={
-                    'Authorization': f'Bearer {admin_token}',
-                    'Content-Type': 'application/json'
-                },
-                timeout=10
-            )
-            
-            if response.status_code != 201:
-                logger.error(f"Failed to create realm: {response.text}")
-                return False
-            
+            _req('POST', '/admin/realms', expect=201, step="create realm",
+                 json={'realm': keycloak_realm, **REALM_SETTINGS})
             logger.info(f"Created realm {keycloak_realm}")
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Failed to check if realm exists: {str(e)}")
-        return False
-    
-    # Check if client exists
-    try:
-        logger.info(f"Checking if client {keycloak_client_id} exists")
-        response = requests.get(
-            f"{keycloak_url}/admin/realms/{keycloak_realm}/clients",
-            params={
-                'clientId': keycloak_client_id
-            },
-            headers={
-                'Authorization': f'Bearer {admin_token}'
-            },
-            timeout=10
-        )
         
-        clients = response.json()
-        client_exists = len(clients) > 0
-        
-        if client_exists:
+        # A realm that was just created has no clients yet
+        clients = clients_response.json() if realm_exists else []
+        if clients:
             logger.info(f"Client {keycloak_client_id} already exists")
             client_id = clients[0]['id']
         else:
             logger.info(f"Client {keycloak_client_id} does not exist, creating it")
+            response = _req('POST', clients_path, expect=201, step="create client",
+                            json={'clientId': keycloak_client_id, **CLIENT_SETTINGS})
             
-            # Create client
-            response = requests.post(
-                f"{keycloak_url}/admin/realms/{keycloak_realm}/clients",
-                json={
-                    'clientId': keycloak_client_id,
-                    'enabled': True,
-                    'name': 'BuyZaar Client',
-                    'description': 'BuyZaar Client',
-                    'rootUrl': 'http://localhost:5173',
-                    'adminUrl': 'http://localhost:5173',
-                    'baseUrl': 'http://localhost:5173',
-                    'redirectUris': [
-                        'http://localhost:5173/*',
-                        'http://localhost:5000/*'
-                    ],
-                    'webOrigins': [
-                        'http://localhost:5173',
-                        'http://localhost:5000'
-                    ],
-                    'publicClient': False,
-                    'directAccessGrantsEnabled': True,
-                    'standardFlowEnabled': True,
-                    'implicitFlowEnabled': False,
-                    'serviceAccountsEnabled': True,
-                    'authorizationServicesEnabled': True,
-                    'fullScopeAllowed': True
-                },
-                headers={
-                    'Authorization': f'Bearer {admin_token}',
-                    'Content-Type': 'application/json'
-                },
-                timeout=10
-            )
-            
-            if response.status_code != 201:
-                logger.error(f"Failed to create client: {response.text}")
-                return False
-            
-            # Get client ID
-            response = requests.get(
-                f"{keycloak_url}/admin/realms/{keycloak_realm}/clients",
-                params={
-                    'clientId': keycloak_client_id
-                },
-                headers={
-                    'Authorization': f'Bearer {admin_token}'
-                },
-                timeout=10
-            )
-            
-            clients = response.json()
-            client_id = clients[0]['id']
+            # The new client's URL is in the Location header; older Keycloak versions need a lookup
+            client_id = response.headers.get('Location', '').rsplit('/', 1)[-1]
+            if not client_id:
+                response = _req('GET', clients_path, step="look up client",
+                                params={'clientId': keycloak_client_id})
+                client_id = response.json()[0]['id']
             
             logger.info(f"Created client {keycloak_client_id} with ID {client_id}")
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Failed to check if client exists: {str(e)}")
-        return False
-    
-    # Get client secret
-    try:
-        logger.info(f"Getting client secret for client {keycloak_client_id}")
-        response = requests.get(
-            f"{keycloak_url}/admin/realms/{keycloak_realm}/clients/{client_id}/client-secret",
-            headers={
-                'Authorization': f'Bearer {admin_token}'
-            },
-            timeout=10
-        )
-        
-        if response.status_code != 200:
-            logger.error(f"Failed to get client secret: {response.text}")
-            return False
         
+        # Get client secret
+        logger.info(f"Getting client secret for client {keycloak_client_id}")
+        response = _req('GET', f"{clients_path}/{client_id}/client-secret", step="get client secret")
         client_secret = response.json()['value']
         logger.info(f"Client secret: {client_secret}")
-        
-        # Update .env file with client secret
-        env_file = os.path.join(os.path.dirname(os.path.dirname(__file__)), '.env')
-        
-        if os.path.exists(env_file):
-            with open(env_file, 'r') as f:
-                env_content = f.read()
-            
-            if 'KEYCLOAK_CLIENT_SECRET=' in env_content:
-                env_content = env_content.replace(
-                    'KEYCLOAK_CLIENT_SECRET=your-client-secret',
-                    f'KEYCLOAK_CLIENT_SECRET={client_secret}'
-                )
-                
-                with open(env_file, 'w') as f:
-                    f.write(env_content)
-                
-                logger.info(f"Updated .env file with client secret")
+    except KeycloakSetupError as e:
+        logger.error(str(e))
+        return False
     except requests.exceptions.RequestException as e:
-        logger.error(f"Failed to get client secret: {str(e)}")
+        logger.error(f"Keycloak request failed: {str(e)}")
         return False
     
+    _update_env_file(client_secret)
+    
+    logger.info("Keycloak setup completed successfully")
     return True
 
+def _update_env_file(client_secret):
+    """Write the client secret into the project's .env file if it exists."""
+    env_file = os.path.join(os.path.dirname(os.path.dirname(__file__)), '.env')
+    
+    if not os.path.exists(env_file):
+        return
+    
+    with open(env_file, 'r') as f:
+        env_content = f.read()
+    
+    # Replace whatever secret is set, or append one, so re-runs always update it
+    secret_line = f'KEYCLOAK_CLIENT_SECRET={client_secret}'
+    env_content, replaced = _CLIENT_SECRET_LINE.subn(lambda _: secret_line, env_content)
+    if not replaced:
+        env_content = env_content.rstrip() + f'\n{secret_line}\n'
+    
+    # Write a temporary file and rename it so a crash never leaves a truncated .env
+    tmp_file = env_file + '.tmp'
+    fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w') as f:
+        f.write(env_content)
+    os.replace(tmp_file, env_file)
+    os.chmod(env_file, 0o600)
+    
+    logger.info(f"Updated .env file with client secret")
+
 if __name__ == '__main__':
+    # Configure logging only when run as a script so importers keep their own root logger
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    
     try:
-        if setup_keycloak():
-            logger.info("Keycloak setup completed successfully")
-            sys.exit(0)
-        else:
-            logger.error("Keycloak setup failed")
-            sys.exit(1)
-    except Exception as e:
-        logger.error(f"Keycloak setup failed with error: {str(e)}")
-        sys.exit(1)
\ No newline at end of file
+        ok = setup_keycloak()
+    except Exception:
+        logger.exception("Keycloak setup failed with error")
+        sys.exit(1)
+    sys.exit(0 if ok else 1)
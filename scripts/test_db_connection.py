@@ -2,68 +2,82 @@
 """
 Test database connection script.
 
-This script tests the database connection using the provided credentials.
+This script tests the database connection using the credentials in the
+DB_NAME, DB_USER, DB_PASSWORD, DB_HOST and DB_PORT environment variables.
 """
 import os
 import sys
 import logging
-import psycopg2
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
+# Server-side CRUD probe; RAISE NOTICE reports the steps back through conn.notices
+CRUD_PROBE_SQL = """
+DO $$
+DECLARE
+    record_id integer;
+    record_name text;
+BEGIN
+    -- Catalog lookup first so existing tables skip the DDL and its lock
+    IF to_regclass('public.test_connection') IS NULL THEN
+        CREATE TABLE test_connection (id SERIAL PRIMARY KEY, name TEXT);
+        RAISE NOTICE 'Created test table';
+    END IF;
+    INSERT INTO test_connection (name) VALUES ('Test connection') RETURNING id INTO record_id;
+    RAISE NOTICE 'Inserted test record with ID %', record_id;
+    SELECT name INTO STRICT record_name FROM test_connection WHERE id = record_id;
+    RAISE NOTICE 'Retrieved test record: %', record_name;
+    DELETE FROM test_connection WHERE id = record_id;
+    RAISE NOTICE 'Deleted test record';
+END
+$$;
+"""
+
 def test_db_connection():
-    """Test the database connection using the provided credentials."""
-    # Database credentials
-    db_name = "buyzaar"
-    db_user = "dmtavs"
-    db_password = "Dmt@1212"
-    db_host = "localhost"
-    db_port = "5432"
+    """Test the database connection using credentials from the environment."""
+    import psycopg2
+    
+    # Get database connection parameters from environment variables
+    params = dict(
+        dbname=os.environ.get('DB_NAME', 'buyzaar'),
+        user=os.environ.get('DB_USER'),
+        password=os.environ.get('DB_PASSWORD'),
+        host=os.environ.get('DB_HOST', 'localhost'),
+        port=os.environ.get('DB_PORT', '5432')
+    )
+    
+    # Never fall back to a default account, so the probe cannot silently test the wrong database
+    missing = [name for name, key in (('DB_USER', 'user'), ('DB_PASSWORD', 'password')) if not params[key]]
+    if missing:
+        logger.error(f"Missing required environment variables: {', '.join(missing)}")
+        return False
     
     # Try to connect to the database
     try:
-        logger.info(f"Connecting to database {db_name} on {db_host}:{db_port} as {db_user}")
+        logger.info(f"Connecting to database {params['dbname']} on {params['host']}:{params['port']} as {params['user']}")
+        # Bound connection attempts and detect half-open sockets instead of hanging on the OS defaults
         conn = psycopg2.connect(
-            dbname=db_name,
-            user=db_user,
-            password=db_password,
-            host=db_host,
-            port=db_port
+            **params,
+            connect_timeout=5,
+            keepalives=1,
+            keepalives_idle=30,
+            keepalives_interval=5,
+            keepalives_count=3
         )
         
-        # Execute a simple query
+        # Run every step on one cursor and commit once at the end
         with conn.cursor() as cur:
+            # Execute a simple query
             cur.execute("SELECT version();")
             version = cur.fetchone()[0]
             logger.info(f"Connected to database: {version}")
-        
-        # Create a test table
-        with conn.cursor() as cur:
-            cur.execute("CREATE TABLE IF NOT EXISTS test_connection (id SERIAL PRIMARY KEY, name TEXT);")
-            conn.commit()
-            logger.info("Created test table")
-            
-            # Insert a test record
-            cur.execute("INSERT INTO test_connection (name) VALUES (%s) RETURNING id;", ("Test connection",))
-            record_id = cur.fetchone()[0]
-            conn.commit()
-            logger.info(f"Inserted test record with ID {record_id}")
-            
-            # Query the test record
-            cur.execute("SELECT name FROM test_connection WHERE id = %s;", (record_id,))
-            name = cur.fetchone()[0]
-            logger.info(f"Retrieved test record: {name}")
             
-            # Delete the test record
-            cur.execute("DELETE FROM test_connection WHERE id = %s;", (record_id,))
-            conn.commit()
-            logger.info("Deleted test record")
+            # Create, insert, read back and delete a test record in one round-trip
+            cur.execute(CRUD_PROBE_SQL)
+            for notice in conn.notices:
+                logger.info(notice.strip())
         
+        conn.commit()
         conn.close()
         logger.info("Database connection test passed")
         return True
@@ -72,13 +86,15 @@ def test_db_connection():
         return False
 
 if __name__ == '__main__':
+    # Configure logging only when run as a script so importers keep their own root logger
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    
     try:
-        if test_db_connection():
-            logger.info("Database connection test passed")
-            sys.exit(0)
-        else:
-            logger.error("Database connection test failed")
-            sys.exit(1)
-    except Exception as e:
-        logger.error(f"Database connection test failed with error: {str(e)}")
-        sys.exit(1)
\ No newline at end of file
+        ok = test_db_connection()
+    except Exception:
+        logger.exception("Database connection test failed with error")
+        sys.exit(1)
+    sys.exit(0 if ok else 1)